@@ -0,0 +1,86 @@
+import hmac
+import logging
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+import rxconfig
+from app.badges import serve_badge_sheet
+from app.cache import active_sessions, analytics_results, replayed_scans, seen_scans
+from app.metrics import decode_metrics
+from app.qr import qr_images, serve_qr_image
+from app.scans import record_scan_batch
+
+
+async def cache_stats(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "active_sessions": active_sessions.stats(),
+            "seen_scans": seen_scans.stats(),
+            "replayed_scans": replayed_scans.stats(),
+            "analytics_results": analytics_results.stats(),
+            "qr_images": {"hits": qr_images.hits, "misses": qr_images.misses},
+        }
+    )
+
+
+async def scanner_stats(request: Request) -> JSONResponse:
+    return JSONResponse(decode_metrics.stats())
+
+
+def _authorized(request: Request) -> bool:
+    scheme, _, key = request.headers.get("authorization", "").partition(" ")
+    return (
+        bool(rxconfig.DEVICE_API_KEY)
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(key.encode(), rxconfig.DEVICE_API_KEY.encode())
+    )
+
+
+async def scan_batch(request: Request) -> JSONResponse:
+    """Record a batch of scans from a kiosk or gateway device.
+
+    Body: ``{"sent_at": <epoch s, optional>, "records": [{"key", "token",
+    "student_id", "scanned_at"}, ...]}``. Responds with per-record results
+    in the same order; see ``record_scan_batch``. Bad or forged records are
+    rejected one by one; only a storage failure fails the whole batch.
+    """
+    if not rxconfig.DEVICE_API_KEY:
+        return JSONResponse({"error": "Batch ingestion is disabled."}, 404)
+    if not _authorized(request):
+        return JSONResponse({"error": "Invalid device key."}, 401)
+    try:
+        body = await request.json()
+        records = body["records"]
+        sent_at = body.get("sent_at")
+        sent_at = None if sent_at is None else float(sent_at)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return JSONResponse({"error": "Malformed batch."}, 400)
+    if not isinstance(records, list):
+        return JSONResponse({"error": "Malformed batch."}, 400)
+    if len(records) > rxconfig.SCAN_BATCH_MAX_RECORDS:
+        return JSONResponse(
+            {"error": f"At most {rxconfig.SCAN_BATCH_MAX_RECORDS} records per batch."},
+            413,
+        )
+    try:
+        results = await record_scan_batch(records, sent_at)
+    except (SQLAlchemyError, OSError) as e:
+        logging.exception(f"Error recording scan batch: {e}")
+        return JSONResponse({"error": "Could not record the batch. Retry it."}, 503)
+    summary = {"inserted": 0, "duplicate": 0, "rejected": 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return JSONResponse({"results": results, **summary})
+
+
+api = Starlette(
+    routes=[
+        Route("/qr/{filename}", serve_qr_image),
+        Route("/badges/{filename}", serve_badge_sheet),
+        Route("/stats/cache", cache_stats),
+        Route("/stats/scanner", scanner_stats),
+        Route("/api/scans/batch", scan_batch, methods=["POST"]),
+    ]
+)
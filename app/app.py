@@ -2,8 +2,13 @@ import reflex as rx
 from app.pages.login import teacher_login_page, student_login_page
 from app.pages.register import teacher_registration_page, student_registration_page
 from app.pages.dashboard import dashboard_page
+from app.pages.kiosk import kiosk_page
 from app.states.auth import AuthState
 from app.database import initialize_db
+from app.ingest import ingestor
+from app.api import api
+from app.cache import active_sessions
+from app.tasks import expire_sessions_periodically
 
 initialize_db()
 
@@ -55,6 +60,7 @@ def index() -> rx.Component:
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    api_transformer=api,
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
         rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
@@ -63,6 +69,8 @@ app = rx.App(
             rel="stylesheet",
         ),
         rx.el.script(src="https://cdn.jsdelivr.net/npm/jsqr@1.4.0/dist/jsQR.js"),
+        rx.el.link(rel="manifest", href="/manifest.webmanifest"),
+        rx.el.script(src="/scan_queue.js"),
     ],
 )
 from app.states.session import SessionState
@@ -70,6 +78,9 @@ from app.states.attendance import AttendanceState
 from app.pages.analytics import analytics_page
 from app.states.analytics import AnalyticsState
 
+app.register_lifespan_task(ingestor.lifespan)
+app.register_lifespan_task(active_sessions.warm)
+app.register_lifespan_task(expire_sessions_periodically)
 app.add_page(index, route="/")
 app.add_page(teacher_login_page, route="/login/teacher")
 app.add_page(student_login_page, route="/login/student")
@@ -81,11 +92,17 @@ app.add_page(
     on_load=[
         AuthState.check_login,
         SessionState.load_active_sessions,
+        SessionState.watch_attendee_counts,
         AttendanceState.load_history,
     ],
 )
+app.add_page(
+    kiosk_page,
+    route="/kiosk",
+    on_load=[AuthState.check_login, SessionState.load_active_sessions],
+)
 app.add_page(
     analytics_page,
     route="/analytics",
     on_load=[AuthState.check_login, AnalyticsState.load_stats],
-)
\ No newline at end of file
+)
@@ -0,0 +1,179 @@
+"""Printable student badge sheets.
+
+Usage, from the repository root:
+
+    python -m app.badges badges.pdf [--workers 4]
+"""
+
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from reportlab.lib.colors import black, lightgrey
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen.canvas import Canvas
+import reflex as rx
+from reflex.config import get_config
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+import rxconfig
+from app import repository
+from app.qr import module_runs
+from app.tokens import TokenError, issue_badge_token, require_stable_secret
+
+COLUMNS = 3
+ROWS = 5
+PER_PAGE = COLUMNS * ROWS
+MARGIN = 10 * mm
+QR_SIDE = 36 * mm
+# Generated sheets are served for an hour, which is plenty to download them.
+SHEET_DIR = rx.get_upload_dir() / "badges"
+SHEET_MAX_AGE_SECONDS = 60 * 60
+
+
+def _draw_badge(
+    pdf: Canvas,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    name: str,
+    number: str,
+    qr: tuple[int, list[tuple[int, int, int]]],
+):
+    pdf.setStrokeColor(lightgrey)
+    pdf.rect(x, y, width, height, stroke=1, fill=0)
+    pdf.setFillColor(black)
+    pdf.setFont("Helvetica-Bold", 10)
+    while (
+        len(name) > 1 and pdf.stringWidth(name, "Helvetica-Bold", 10) > width - 6 * mm
+    ):
+        name = name[:-2] + "…"
+    pdf.drawCentredString(x + width / 2, y + height - 6 * mm, name)
+    pdf.setFont("Helvetica", 8)
+    pdf.drawCentredString(x + width / 2, y + 3 * mm, number)
+
+    size, runs = qr
+    module = QR_SIDE / size
+    left = x + (width - QR_SIDE) / 2
+    top = y + (height + QR_SIDE) / 2 - 1 * mm
+    path = pdf.beginPath()
+    for row, start, length in runs:
+        path.rect(
+            left + start * module, top - (row + 1) * module, length * module, module
+        )
+    pdf.drawPath(path, stroke=0, fill=1)
+
+
+def generate_badge_pdf(
+    students: list[tuple[int, str, str | None]],
+    output,
+    workers: int,
+    progress: Callable[[int, int], None] | None = None,
+    mp_context: BaseContext | None = None,
+):
+    """Lay out one badge per student, ``PER_PAGE`` to an A4 page.
+
+    Tokens are signed here, and the QR matrices, which dominate the cost, are
+    computed in a process pool. Only ``2 * workers`` pages of matrices are in
+    flight at once, and each page is drawn as soon as they are back, so the
+    matrices stay bounded. The drawn pages are not: reportlab's Canvas keeps
+    every page until ``save()``, about 100 KB each. Callers inside the server
+    pass a spawn ``mp_context``, since forking a process that runs other
+    threads can leave a child holding one of their locks.
+    """
+    require_stable_secret()
+    pdf = Canvas(str(output) if isinstance(output, Path) else output, pagesize=A4)
+    pdf.setTitle("Student badges")
+    page_width, page_height = A4
+    width = (page_width - 2 * MARGIN) / COLUMNS
+    height = (page_height - 2 * MARGIN) / ROWS
+    pages = (students[i : i + PER_PAGE] for i in range(0, len(students), PER_PAGE))
+    in_flight = deque()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+
+        def submit():
+            page = next(pages, None)
+            if page is not None:
+                payloads = [issue_badge_token(student_id) for student_id, _, _ in page]
+                in_flight.append((page, pool.map(module_runs, payloads)))
+
+        for _ in range(workers * 2):
+            submit()
+        while in_flight:
+            page, matrices = in_flight.popleft()
+            submit()
+            for index, ((_, name, number), qr) in enumerate(zip(page, matrices)):
+                column, row = index % COLUMNS, index // COLUMNS
+                _draw_badge(
+                    pdf,
+                    MARGIN + column * width,
+                    page_height - MARGIN - (row + 1) * height,
+                    width,
+                    height,
+                    name,
+                    number or "",
+                    qr,
+                )
+            pdf.showPage()
+            done += len(page)
+            if progress:
+                progress(done, len(students))
+    pdf.save()
+
+
+def new_sheet_path() -> Path:
+    """Pick an unguessable file name for a sheet and drop expired ones."""
+    SHEET_DIR.mkdir(parents=True, exist_ok=True)
+    cutoff = time.time() - SHEET_MAX_AGE_SECONDS
+    for stale in SHEET_DIR.glob("*.pdf"):
+        if stale.stat().st_mtime < cutoff:
+            stale.unlink(missing_ok=True)
+    return SHEET_DIR / f"{secrets.token_urlsafe(24)}.pdf"
+
+
+def sheet_url(path: Path) -> str:
+    return f"{get_config().api_url}/badges/{path.name}"
+
+
+async def serve_badge_sheet(request: Request) -> Response:
+    name = request.path_params["filename"]
+    path = SHEET_DIR / name
+    if "/" in name or not name.endswith(".pdf") or not path.is_file():
+        return Response(status_code=404)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename="student-badges.pdf",
+        headers={"Cache-Control": "private, no-store"},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--workers", type=int, default=rxconfig.BADGE_WORKERS)
+    args = parser.parse_args()
+    try:
+        require_stable_secret()
+    except TokenError as e:
+        parser.exit(1, f"{e}\n")
+    students = asyncio.run(repository.list_students())
+
+    def report(done: int, total: int):
+        print(f"\r{done}/{total} badges", end="", file=sys.stderr, flush=True)
+
+    generate_badge_pdf(students, args.output, args.workers, report)
+    print(f"\nWrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+import rxconfig
+from app import repository
+from app.models import Session, ensure_timezone
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """The fields of a Session that the scan path needs."""
+
+    id: int
+    teacher_id: int
+    course_name: str
+    expires_at: datetime
+    is_active: bool
+
+    @classmethod
+    def from_session(cls, session: Session) -> "CachedSession":
+        return cls(
+            id=session.id,
+            teacher_id=session.teacher_id,
+            course_name=session.course_name,
+            expires_at=ensure_timezone(session.expires_at),
+            is_active=session.is_active,
+        )
+
+
+class ActiveSessionCache:
+    """Process-local cache of active sessions for the scan path.
+
+    Entries live for at most ``ttl`` seconds, which bounds how long another
+    backend worker's ``end_session`` can go unnoticed here. Inactive
+    sessions are returned but never cached.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[int, tuple[CachedSession, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, session: Session):
+        cached = CachedSession.from_session(session)
+        if cached.is_active and cached.expires_at >= datetime.now(timezone.utc):
+            self._entries[session.id] = (cached, time.monotonic() + self.ttl)
+
+    def invalidate(self, session_id: int):
+        self._entries.pop(session_id, None)
+
+    async def get(self, session_id: int) -> CachedSession | None:
+        """Return the session, reporting it inactive once it is past expiry."""
+        entry = self._entries.get(session_id)
+        if entry is not None and time.monotonic() < entry[1]:
+            self.hits += 1
+            cached = entry[0]
+        else:
+            self.misses += 1
+            self.invalidate(session_id)
+            session = await repository.get_class_session(session_id)
+            if session is None:
+                return None
+            self.put(session)
+            cached = CachedSession.from_session(session)
+        if cached.is_active and cached.expires_at < datetime.now(timezone.utc):
+            self.invalidate(session_id)
+            return replace(cached, is_active=False)
+        return cached
+
+    async def warm(self):
+        """Load every currently active session."""
+        now = datetime.now(timezone.utc)
+        for session in await repository.list_all_active_sessions(now):
+            self.put(session)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SeenScans:
+    """Student ids already recorded per session, for answering repeat scans.
+
+    A session's set is loaded from the database on first use and only ever
+    receives committed rows, so membership is a definite duplicate. A miss
+    still goes through the ingestor, where the unique index has the final say.
+    """
+
+    def __init__(self):
+        self._seen: dict[int, set[int]] = {}
+        self._loading: dict[int, asyncio.Task] = {}
+        self.hits = 0
+
+    async def _load(self, session_id: int):
+        student_ids = await repository.list_session_student_ids(session_id)
+        # Skip storing if the session was dropped while the query ran.
+        if self._loading.pop(session_id, None) is not None:
+            self._seen.setdefault(session_id, set()).update(student_ids)
+
+    async def contains(self, session_id: int, student_id: int) -> bool:
+        if session_id not in self._seen:
+            task = self._loading.get(session_id)
+            if task is None:
+                task = asyncio.create_task(self._load(session_id))
+                self._loading[session_id] = task
+            try:
+                await asyncio.shield(task)
+            except Exception as e:
+                self._loading.pop(session_id, None)
+                logging.exception(f"Error loading scans for session {session_id}: {e}")
+                return False
+        if student_id in self._seen.get(session_id, ()):
+            self.hits += 1
+            return True
+        return False
+
+    def add(self, session_id: int, student_id: int):
+        """Record a committed attendance row if the session's set is loaded."""
+        seen = self._seen.get(session_id)
+        if seen is not None:
+            seen.add(student_id)
+
+    def drop(self, session_id: int):
+        self._seen.pop(session_id, None)
+        self._loading.pop(session_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._seen),
+            "students": sum(len(seen) for seen in self._seen.values()),
+            "hits": self.hits,
+        }
+
+
+class ReplayLedger:
+    """Outcomes of recently settled offline scans, keyed by idempotency key.
+
+    A replay of a settled key is answered from here without verifying the
+    token again or going near the ingestor.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._outcomes: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self.hits = 0
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        outcome = self._outcomes.get(key)
+        if outcome is not None:
+            self.hits += 1
+            self._outcomes.move_to_end(key)
+        return outcome
+
+    def put(self, key: str, outcome: tuple[str, str]):
+        self._outcomes[key] = outcome
+        self._outcomes.move_to_end(key)
+        while len(self._outcomes) > self.size:
+            self._outcomes.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self._outcomes), "hits": self.hits}
+
+
+class AnalyticsCache:
+    """Computed analytics per teacher and filter, keyed by a data version.
+
+    Each teacher's version is bumped when their sessions or attendance
+    change, so entries from before the change are never hit again and age
+    out of the LRU. Entries also expire after ``ttl`` seconds, which bounds
+    how long a change made through another backend worker, or a week/month
+    window moving on, can go unnoticed.
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._versions: dict[int, int] = {}
+        self._entries: OrderedDict[tuple, tuple[object, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bump(self, teacher_id: int):
+        self._versions[teacher_id] = self._versions.get(teacher_id, 0) + 1
+
+    def key(self, teacher_id: int, filters: tuple) -> tuple:
+        """The cache key for the teacher's data as of now.
+
+        Take it before querying, so a result computed while a change commits
+        is stored under the old version and never served.
+        """
+        return (teacher_id, filters, self._versions.get(teacher_id, 0))
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[1]:
+            self.misses += 1
+            self._entries.pop(key, None)
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+active_sessions = ActiveSessionCache(ttl=rxconfig.ACTIVE_SESSION_CACHE_TTL_SECONDS)
+seen_scans = SeenScans()
+replayed_scans = ReplayLedger(size=rxconfig.SCAN_REPLAY_CACHE_SIZE)
+analytics_results = AnalyticsCache(
+    size=rxconfig.ANALYTICS_CACHE_SIZE, ttl=rxconfig.ANALYTICS_CACHE_TTL_SECONDS
+)
@@ -31,6 +31,7 @@ def sidebar() -> rx.Component:
                         ),
                         sidebar_link("Dashboard", "layout-dashboard", "/dashboard"),
                         sidebar_link("Analytics", "bar-chart-3", "/analytics"),
+                        sidebar_link("Kiosk", "scan-line", "/kiosk"),
                         class_name="flex flex-col space-y-1",
                     ),
                 ),
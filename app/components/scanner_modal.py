@@ -5,9 +5,37 @@ SCANNER_SCRIPT = """
 window.qrScanner = {
     stream: null,
     reqId: null,
+    timer: null,
     facingMode: "environment",
+    // Decode a centre square covering this fraction of the shorter side,
+    // downscaled to at most DECODE_SIZE pixels, at most MAX_DECODES_PER_SECOND.
+    ROI_FRACTION: 0.75,
+    DECODE_SIZE: 480,
+    MAX_DECODES_PER_SECOND: 8,
+    // Without a detection the rate halves every IDLE_STEP_MS down to this floor.
+    IDLE_DECODES_PER_SECOND: 2,
+    IDLE_STEP_MS: 3000,
+    activeSince: 0,
+    paused: false,
+    // Continuous mode (kiosk): onDetect receives each payload, the camera
+    // keeps running at full rate, and the same payload is ignored for
+    // DEBOUNCE_MS after it was last reported.
+    options: {},
+    DEBOUNCE_MS: 3000,
+    lastData: null,
+    lastDetectAt: 0,
+    visibilityHandler: null,
+    detector: null,
+    worker: null,
+    decoding: false,
+    // Per-engine decode timings, drained by takeStats() when the scanner closes.
+    stats: {},
+    roi: null,
+    frameCanvas: null,
+    frameContext: null,
 
-    init: function() {
+    init: function(options) {
+        if (options) this.options = options;
         const video = document.getElementById("qr-video");
         const canvasElement = document.getElementById("qr-canvas");
         const statusMsg = document.getElementById("qr-status");
@@ -40,6 +68,10 @@ window.qrScanner = {
         // Stop any existing stream
         this.stop();
 
+        // Stop decoding and release the camera frames while the tab is hidden.
+        this.visibilityHandler = () => document.hidden ? this.pause() : this.resume();
+        document.addEventListener("visibilitychange", this.visibilityHandler);
+
         const constraints = { 
             video: { 
                 facingMode: this.facingMode,
@@ -56,11 +88,13 @@ window.qrScanner = {
 
                 // Ensure video plays only when metadata is loaded
                 video.onloadedmetadata = () => {
+                    this.prepareFrames(video, canvasElement);
                     video.play().catch(e => {
                         console.error("Play error:", e);
                         this.showError("Error starting video stream: " + e.message);
                     });
-                    requestAnimationFrame(this.tick.bind(this));
+                    this.activeSince = performance.now();
+                    this.schedule();
                     if(statusMsg) statusMsg.innerText = "Camera active. Align QR code within frame.";
                 };
             })
@@ -95,18 +129,108 @@ window.qrScanner = {
             this.stream.getTracks().forEach(t => t.stop());
             this.stream = null;
         }
+        this.cancelTick();
+        if (this.visibilityHandler) {
+            document.removeEventListener("visibilitychange", this.visibilityHandler);
+            this.visibilityHandler = null;
+        }
+        this.paused = false;
+        if (this.worker) {
+            this.worker.terminate();
+            this.worker = null;
+        }
+        this.decoding = false;
+    },
+
+    prepareFrames: function(video, canvasElement) {
+        // Size every canvas once per stream; assigning width/height clears and
+        // reallocates the backing store, so it must not happen per frame.
+        canvasElement.width = video.videoWidth;
+        canvasElement.height = video.videoHeight;
+        const side = Math.floor(Math.min(video.videoWidth, video.videoHeight) * this.ROI_FRACTION);
+        const scale = Math.min(1, this.DECODE_SIZE / side);
+        this.roi = {
+            x: Math.floor((video.videoWidth - side) / 2),
+            y: Math.floor((video.videoHeight - side) / 2),
+            side: side,
+            size: Math.floor(side * scale),
+            scale: scale,
+        };
+        this.frameCanvas = document.createElement("canvas");
+        this.frameCanvas.width = this.roi.size;
+        this.frameCanvas.height = this.roi.size;
+        this.frameContext = this.frameCanvas.getContext("2d", { willReadFrequently: true });
+
+        // Prefer the native detector: it reads the video element directly.
+        if ('BarcodeDetector' in window && !this.detector) {
+            BarcodeDetector.getSupportedFormats().then(formats => {
+                if (formats.includes("qr_code") && !this.detector) {
+                    this.detector = new BarcodeDetector({ formats: ["qr_code"] });
+                }
+            }).catch(() => {});
+        }
+        if (window.Worker && !this.worker) {
+            this.worker = new Worker("/qr_worker.js");
+            this.worker.onmessage = (event) => {
+                this.decoding = false;
+                this.record("worker", performance.now() - this.workerStartedAt, event.data);
+                this.onDecoded(this.fromRoi(event.data));
+            };
+            this.worker.onerror = (e) => {
+                console.error("QR worker error:", e);
+                this.worker = null;
+                this.decoding = false;
+            };
+        }
+    },
+
+    cancelTick: function() {
+        if (this.timer) {
+            clearTimeout(this.timer);
+            this.timer = null;
+        }
         if (this.reqId) {
             cancelAnimationFrame(this.reqId);
             this.reqId = null;
         }
     },
 
+    schedule: function() {
+        const idleSteps = this.options.onDetect
+            ? 0
+            : Math.floor((performance.now() - this.activeSince) / this.IDLE_STEP_MS);
+        const delay = Math.min(
+            1000 / this.IDLE_DECODES_PER_SECOND,
+            (1000 / this.MAX_DECODES_PER_SECOND) * Math.pow(2, idleSteps)
+        );
+        this.timer = setTimeout(() => {
+            this.timer = null;
+            this.reqId = requestAnimationFrame(this.tick.bind(this));
+        }, delay);
+    },
+
+    pause: function() {
+        if (!this.stream || this.paused) return;
+        this.paused = true;
+        this.cancelTick();
+        this.stream.getTracks().forEach(t => t.enabled = false);
+    },
+
+    resume: function() {
+        if (!this.stream || !this.paused) return;
+        this.paused = false;
+        this.stream.getTracks().forEach(t => t.enabled = true);
+        this.activeSince = performance.now();
+        this.schedule();
+    },
+
     switchCamera: function() {
         this.facingMode = (this.facingMode === "user") ? "environment" : "user";
         this.init();
     },
 
     tick: function() {
+        this.reqId = null;
         const video = document.getElementById("qr-video");
         const canvasElement = document.getElementById("qr-canvas");
 
@@ -116,55 +240,156 @@ window.qrScanner = {
             return;
         }
 
-        if (video.readyState === video.HAVE_ENOUGH_DATA) {
-            const canvas = canvasElement.getContext("2d", { willReadFrequently: true });
-            canvasElement.height = video.videoHeight;
-            canvasElement.width = video.videoWidth;
-            canvas.drawImage(video, 0, 0, canvasElement.width, canvasElement.height);
-
-            if (typeof jsQR !== 'undefined') {
-                const imageData = canvas.getImageData(0, 0, canvasElement.width, canvasElement.height);
-                const code = jsQR(imageData.data, imageData.width, imageData.height, {
+        const ready = !this.decoding && this.roi && video.readyState === video.HAVE_ENOUGH_DATA;
+        if (ready && this.detector) {
+            this.detectNative(video);
+        } else if (ready) {
+            const roi = this.roi;
+            this.frameContext.drawImage(video, roi.x, roi.y, roi.side, roi.side, 0, 0, roi.size, roi.size);
+            const imageData = this.frameContext.getImageData(0, 0, roi.size, roi.size);
+            if (this.worker) {
+                this.decoding = true;
+                this.workerStartedAt = performance.now();
+                const buffer = imageData.data.buffer;
+                this.worker.postMessage({ width: roi.size, height: roi.size, buffer: buffer }, [buffer]);
+            } else if (typeof jsQR !== 'undefined') {
+                const started = performance.now();
+                const code = jsQR(imageData.data, roi.size, roi.size, {
                     inversionAttempts: "dontInvert",
                 });
+                this.record("inline", performance.now() - started, code);
+                this.onDecoded(this.fromRoi(code));
+            }
+        }
+        if (this.stream) this.schedule();
+    },
 
-                if (code) {
-                    this.drawLine(canvas, code.location.topLeftCorner, code.location.topRightCorner, "#10b981");
-                    this.drawLine(canvas, code.location.topRightCorner, code.location.bottomRightCorner, "#10b981");
-                    this.drawLine(canvas, code.location.bottomRightCorner, code.location.bottomLeftCorner, "#10b981");
-                    this.drawLine(canvas, code.location.bottomLeftCorner, code.location.topLeftCorner, "#10b981");
-
-                    const overlay = document.getElementById("qr-overlay");
-                    if(overlay) {
-                        overlay.style.borderColor = "#10b981";
-                        overlay.style.boxShadow = "0 0 20px rgba(16,185,129,0.5)";
-                    }
-
-                    let input = document.getElementById("qr-input");
-                    if (input && input.value !== code.data) {
-                        const statusMsg = document.getElementById("qr-status");
-                        if(statusMsg) {
-                            statusMsg.innerText = "QR Code detected!";
-                            statusMsg.className = "text-xs text-emerald-600 mb-2 text-center font-bold";
-                        }
-
-                        // Vibrate for feedback if supported
-                        if (navigator.vibrate) navigator.vibrate(100);
-
-                        let nativeInputValueSetter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
-                        nativeInputValueSetter.call(input, code.data);
-                        input.dispatchEvent(new Event('input', { bubbles: true }));
-                    }
-                } else {
-                    const overlay = document.getElementById("qr-overlay");
-                    if(overlay) {
-                         overlay.style.borderColor = "rgba(255,255,255,0.5)";
-                         overlay.style.boxShadow = "none";
-                    }
-                }
+    detectNative: function(video) {
+        this.decoding = true;
+        const started = performance.now();
+        this.detector.detect(video).then(codes => {
+            this.decoding = false;
+            const code = codes.length ? codes[0] : null;
+            this.record("native", performance.now() - started, code);
+            if (!code) return this.onDecoded(null);
+            const [tl, tr, br, bl] = code.cornerPoints;
+            this.onDecoded({
+                data: code.rawValue,
+                location: { topLeftCorner: tl, topRightCorner: tr, bottomRightCorner: br, bottomLeftCorner: bl },
+            });
+        }).catch(err => {
+            // Fall back to jsQR for the rest of this page's lifetime.
+            console.error("BarcodeDetector error:", err);
+            this.detector = null;
+            this.decoding = false;
+        });
+    },
+
+    fromRoi: function(code) {
+        // Map corners from the downscaled region back to video coordinates.
+        if (!code) return null;
+        const roi = this.roi;
+        const toVideo = (p) => ({ x: roi.x + p.x / roi.scale, y: roi.y + p.y / roi.scale });
+        const loc = code.location;
+        return {
+            data: code.data,
+            location: {
+                topLeftCorner: toVideo(loc.topLeftCorner),
+                topRightCorner: toVideo(loc.topRightCorner),
+                bottomRightCorner: toVideo(loc.bottomRightCorner),
+                bottomLeftCorner: toVideo(loc.bottomLeftCorner),
+            },
+        };
+    },
+
+    record: function(engine, ms, found) {
+        const s = this.stats[engine] || (this.stats[engine] = { count: 0, found: 0, total_ms: 0, max_ms: 0 });
+        s.count += 1;
+        s.found += found ? 1 : 0;
+        s.total_ms += ms;
+        s.max_ms = Math.max(s.max_ms, ms);
+    },
+
+    takeStats: function() {
+        const stats = this.stats;
+        this.stats = {};
+        return stats;
+    },
+
+    onDecoded: function(code) {
+        const canvasElement = document.getElementById("qr-canvas");
+        const overlay = document.getElementById("qr-overlay");
+        if (!canvasElement || !this.stream) return;
+        const canvas = canvasElement.getContext("2d");
+        canvas.clearRect(0, 0, canvasElement.width, canvasElement.height);
+
+        if (!code) {
+            if(overlay) {
+                 overlay.style.borderColor = "rgba(255,255,255,0.5)";
+                 overlay.style.boxShadow = "none";
             }
+            return;
         }
-        this.reqId = requestAnimationFrame(this.tick.bind(this));
+
+        const loc = code.location;
+        this.drawLine(canvas, loc.topLeftCorner, loc.topRightCorner, "#10b981");
+        this.drawLine(canvas, loc.topRightCorner, loc.bottomRightCorner, "#10b981");
+        this.drawLine(canvas, loc.bottomRightCorner, loc.bottomLeftCorner, "#10b981");
+        this.drawLine(canvas, loc.bottomLeftCorner, loc.topLeftCorner, "#10b981");
+
+        if(overlay) {
+            overlay.style.borderColor = "#10b981";
+            overlay.style.boxShadow = "0 0 20px rgba(16,185,129,0.5)";
+        }
+
+        if (this.options.onDetect) {
+            const now = performance.now();
+            if (code.data === this.lastData && now - this.lastDetectAt < this.DEBOUNCE_MS) {
+                this.lastDetectAt = now;
+                return;
+            }
+            this.lastData = code.data;
+            this.lastDetectAt = now;
+            if (navigator.vibrate) navigator.vibrate(100);
+            this.options.onDetect(code.data);
+            return;
+        }
+
+        // Vibrate for feedback if supported
+        if (navigator.vibrate) navigator.vibrate(100);
+
+        // The camera is no longer needed. Every capture is queued first: a
+        // saturated network can leave navigator.onLine true while the live
+        // submission sits in the socket buffer until it has rotated out. Online,
+        // the payload is also submitted with its queue key and checked against
+        // the server clock; process_scan acks the key once the scan is recorded,
+        // and anything left is replayed with its age.
+        this.stop();
+        const online = navigator.onLine;
+        const key = window.scanQueue.add(code.data, online);
+        if (online) {
+            const input = document.getElementById("qr-input");
+            const keyInput = document.getElementById("qr-key");
+            const form = document.getElementById("qr-form");
+            if (input && keyInput && form) {
+                input.value = code.data;
+                keyInput.value = key;
+                form.requestSubmit();
+                keyInput.value = "";
+            }
+            return;
+        }
+        const statusMsg = document.getElementById("qr-status");
+        if(statusMsg) {
+            statusMsg.innerText = "Saved offline. Attendance will sync when you are back online.";
+            statusMsg.className = "text-xs text-emerald-600 mb-2 text-center font-bold";
+        }
+        setTimeout(() => this.close(), 2000);
+    },
+
+    close: function() {
+        const cancel = document.getElementById("qr-cancel");
+        if (cancel) cancel.click();
     },
 
     drawLine: function(canvas, begin, end, color) {
@@ -179,15 +404,58 @@ window.qrScanner = {
 """
 
 
-def scanner_modal() -> rx.Component:
+def scanner_viewport() -> rx.Component:
+    """Camera view and status line driven by ``window.qrScanner``."""
+    return rx.fragment(
+        rx.script(SCANNER_SCRIPT),
+        rx.el.div(
+            rx.el.video(
+                id="qr-video",
+                class_name="absolute inset-0 w-full h-full object-cover",
+            ),
+            rx.el.canvas(
+                id="qr-canvas",
+                class_name="absolute inset-0 w-full h-full object-cover opacity-90",
+            ),
+            rx.el.div(
+                id="qr-overlay",
+                class_name="absolute inset-0 border-4 border-white/50 z-10 transition-all duration-300 m-8 rounded-lg",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    rx.icon("rotate-cw", class_name="w-5 h-5 text-white"),
+                    on_click=rx.call_script("window.qrScanner.switchCamera()"),
+                    class_name="bg-black/50 p-2 rounded-full hover:bg-black/70 transition-colors",
+                    title="Switch Camera",
+                ),
+                rx.el.button(
+                    rx.icon("refresh-ccw", class_name="w-5 h-5 text-white"),
+                    on_click=rx.call_script("window.qrScanner.init()"),
+                    class_name="bg-black/50 p-2 rounded-full hover:bg-black/70 transition-colors",
+                    title="Reload Camera",
+                ),
+                class_name="absolute top-2 right-2 flex gap-2 z-20",
+            ),
+            class_name="w-full h-64 bg-black rounded-lg mb-4 relative overflow-hidden",
+        ),
+        rx.el.p(
+            "Initializing camera...",
+            id="qr-status",
+            class_name="text-xs text-gray-500 mb-2 text-center font-mono h-auto",
+        ),
+    )
+
+
+def scanner_modal(trigger: rx.Component) -> rx.Component:
+    """The scanner dialog, opened client-side so it still works offline."""
     return rx.radix.primitives.dialog.root(
+        rx.radix.primitives.dialog.trigger(trigger, as_child=True),
         rx.radix.primitives.dialog.portal(
             rx.radix.primitives.dialog.overlay(
                 class_name="fixed inset-0 bg-black/50 backdrop-blur-sm z-40"
             ),
             rx.radix.primitives.dialog.content(
                 rx.el.div(
-                    rx.script(SCANNER_SCRIPT),
                     rx.radix.primitives.dialog.title(
                         "Scan QR Code",
                         class_name="text-2xl font-semibold text-gray-800 mb-2",
@@ -197,53 +465,17 @@ def scanner_modal() -> rx.Component:
                         class_name="text-sm text-gray-600 mb-6",
                     ),
                     rx.el.div(
-                        rx.el.div(
-                            rx.el.video(
-                                id="qr-video",
-                                class_name="absolute inset-0 w-full h-full object-cover",
-                            ),
-                            rx.el.canvas(
-                                id="qr-canvas",
-                                class_name="absolute inset-0 w-full h-full object-cover opacity-90",
-                            ),
-                            rx.el.div(
-                                id="qr-overlay",
-                                class_name="absolute inset-0 border-4 border-white/50 z-10 transition-all duration-300 m-8 rounded-lg",
+                        scanner_viewport(),
+                        rx.el.form(
+                            rx.el.input(
+                                id="qr-input",
+                                name="scan_code",
+                                placeholder="Enter code manually if scan fails",
+                                class_name="w-full px-4 py-3 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 font-mono text-center mb-4",
                             ),
-                            rx.el.div(
-                                rx.el.button(
-                                    rx.icon(
-                                        "rotate-cw", class_name="w-5 h-5 text-white"
-                                    ),
-                                    on_click=rx.call_script(
-                                        "window.qrScanner.switchCamera()"
-                                    ),
-                                    class_name="bg-black/50 p-2 rounded-full hover:bg-black/70 transition-colors",
-                                    title="Switch Camera",
-                                ),
-                                rx.el.button(
-                                    rx.icon(
-                                        "refresh-ccw", class_name="w-5 h-5 text-white"
-                                    ),
-                                    on_click=rx.call_script("window.qrScanner.init()"),
-                                    class_name="bg-black/50 p-2 rounded-full hover:bg-black/70 transition-colors",
-                                    title="Reload Camera",
-                                ),
-                                class_name="absolute top-2 right-2 flex gap-2 z-20",
-                            ),
-                            class_name="w-full h-64 bg-black rounded-lg mb-4 relative overflow-hidden",
-                        ),
-                        rx.el.p(
-                            "Initializing camera...",
-                            id="qr-status",
-                            class_name="text-xs text-gray-500 mb-2 text-center font-mono h-auto",
-                        ),
-                        rx.el.input(
-                            id="qr-input",
-                            placeholder="Enter code manually if scan fails",
-                            on_change=AttendanceState.set_scan_code,
-                            class_name="w-full px-4 py-3 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 font-mono text-center mb-4",
-                            default_value=AttendanceState.scan_code,
+                            rx.el.input(id="qr-key", name="scan_key", type="hidden"),
+                            id="qr-form",
+                            on_submit=AttendanceState.submit_scan,
                         ),
                         rx.el.details(
                             rx.el.summary(
@@ -267,22 +499,29 @@ def scanner_modal() -> rx.Component:
                         rx.radix.primitives.dialog.close(
                             rx.el.button(
                                 "Cancel",
+                                id="qr-cancel",
+                                type="button",
                                 class_name="bg-gray-200 text-gray-800 font-semibold py-2 px-4 rounded-lg hover:bg-gray-300 transition duration-200",
                             )
                         ),
                         rx.el.button(
                             "Mark Attendance",
-                            on_click=AttendanceState.process_scan,
+                            type="submit",
+                            form="qr-form",
                             class_name="bg-violet-600 text-white font-semibold py-2 px-4 rounded-lg hover:bg-violet-700 transition duration-200 ml-2",
                         ),
                         class_name="flex justify-end",
                     ),
-                    on_mount=rx.call_script("window.qrScanner.init()"),
-                    on_unmount=rx.call_script("window.qrScanner.stop()"),
+                    on_mount=rx.call_script("window.qrScanner.init({})"),
+                    on_unmount=[
+                        rx.call_script(
+                            "window.qrScanner.takeStats()",
+                            callback=AttendanceState.report_decode_stats,
+                        ),
+                        rx.call_script("window.qrScanner.stop()"),
+                    ],
                 ),
                 class_name="fixed top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 bg-white rounded-xl shadow-2xl p-6 w-full max-w-md z-50",
             ),
         ),
-        open=AttendanceState.show_scanner,
-        on_open_change=AttendanceState.toggle_scanner,
-    )
\ No newline at end of file
+    )
@@ -1,14 +1,114 @@
 import reflex as rx
-from sqlmodel import SQLModel, create_engine
+from reflex.model import (
+    get_engine as get_rx_engine,
+    get_async_engine as get_rx_async_engine,
+)
+from sqlalchemy import event
+from sqlmodel import SQLModel, Session as DBSession, inspect, select, text
 import logging
-from app.models import User, Session, Attendance
+import rxconfig
+from app.models import User, Session, Attendance, AttendanceByStudent
+from app.rollups import rebuild_rollups
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the configured PRAGMAs to a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in rxconfig.SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def configure_engine(engine):
+    """Attach the SQLite connection profile to an engine."""
+    if engine.dialect.name == "sqlite" and not event.contains(
+        engine, "connect", _apply_sqlite_pragmas
+    ):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def get_engine():
+    """Return the engine shared with rx.session(), with the SQLite profile applied."""
+    return configure_engine(get_rx_engine())
+
+
+def get_session() -> DBSession:
+    """Open a database session on the shared engine."""
+    return DBSession(get_engine())
+
+
+def get_async_engine():
+    """Return the async engine shared with rx.asession(), with the SQLite profile applied."""
+    engine = get_rx_async_engine(None)
+    configure_engine(engine.sync_engine)
+    return engine
+
+
+def get_async_session():
+    """Open an async database session on the shared async engine."""
+    get_async_engine()
+    return rx.asession()
+
+
+def _migrate_columns(engine):
+    """Add columns introduced after the original schema to existing tables."""
+    columns = {c["name"] for c in inspect(engine).get_columns("session")}
+    if "attendee_count" not in columns:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "ALTER TABLE session "
+                    "ADD COLUMN attendee_count INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+            conn.execute(
+                text(
+                    "UPDATE session SET attendee_count = "
+                    "(SELECT COUNT(*) FROM attendance "
+                    "WHERE attendance.session_id = session.id)"
+                )
+            )
+
+
+def _migrate_indexes(engine):
+    """Bring indexes on tables that predate them in line with the models."""
+    existing = {ix["name"] for ix in inspect(engine).get_indexes("attendance")}
+    if "ux_attendance_session_student" not in existing:
+        with engine.begin() as conn:
+            removed = conn.execute(
+                text(
+                    "DELETE FROM attendance WHERE id NOT IN "
+                    "(SELECT MIN(id) FROM attendance GROUP BY session_id, student_id)"
+                )
+            ).rowcount
+        if removed:
+            logging.warning(f"Removed {removed} duplicate attendance rows.")
+    if "ix_attendance_student_id" in existing:
+        # Superseded by ix_attendance_student_history, which leads on student_id.
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_attendance_student_id"))
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _migrate_rollups(engine):
+    """Backfill the analytics rollups on databases that predate them."""
+    with engine.begin() as conn:
+        has_rollups = conn.execute(select(AttendanceByStudent).limit(1)).first()
+        if not has_rollups and conn.execute(select(Attendance).limit(1)).first():
+            rebuild_rollups(conn)
+            logging.warning("Backfilled the attendance rollups.")
 
 
 def initialize_db():
     """Initialize the database and create tables if they don't exist."""
     try:
-        db_url = "sqlite:///reflex.db"
-        engine = create_engine(db_url)
+        engine = get_engine()
         SQLModel.metadata.create_all(engine)
+        _migrate_columns(engine)
+        _migrate_indexes(engine)
+        _migrate_rollups(engine)
     except Exception as e:
-        logging.exception(f"Error initializing database: {e}")
\ No newline at end of file
+        logging.exception(f"Error initializing database: {e}")
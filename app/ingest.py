@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import update
+import rxconfig
+from app import live, rollups
+from app.cache import analytics_results, seen_scans
+from app.database import get_async_session
+from app.models import Attendance, Session
+
+
+@dataclass
+class PendingScan:
+    """A validated scan waiting for the background writer."""
+
+    session_id: int
+    student_id: int
+    scanned_at: datetime
+    result: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+async def record_attendance(
+    scans: list[tuple[int, int, datetime]],
+) -> set[tuple[int, int]]:
+    """Insert (session_id, student_id, scanned_at) rows in one transaction.
+
+    Returns the (session_id, student_id) pairs that were new. The same
+    transaction bumps ``Session.attendee_count`` and the analytics rollups;
+    once committed, the new counts go to live dashboards and every pair to
+    the seen-set.
+    """
+    if not scans:
+        return set()
+    rows = {}
+    for session_id, student_id, scanned_at in scans:
+        rows.setdefault(
+            (session_id, student_id),
+            {
+                "session_id": session_id,
+                "student_id": student_id,
+                "scanned_at": scanned_at,
+                "status": "present",
+            },
+        )
+    async with get_async_session() as db:
+        inserted = set(
+            (
+                await db.exec(
+                    insert(Attendance)
+                    .values(list(rows.values()))
+                    .on_conflict_do_nothing(index_elements=["session_id", "student_id"])
+                    .returning(Attendance.session_id, Attendance.student_id)
+                )
+            ).all()
+        )
+        added = Counter(session_id for session_id, _ in inserted)
+        counts = {}
+        teachers = {}
+        for session_id, count in added.items():
+            counts[session_id], teachers[session_id] = (
+                await db.exec(
+                    update(Session)
+                    .where(Session.id == session_id)
+                    .values(attendee_count=Session.attendee_count + count)
+                    .returning(Session.attendee_count, Session.teacher_id)
+                )
+            ).one()
+        await rollups.add_attendance(
+            db,
+            [
+                (
+                    teachers[session_id],
+                    session_id,
+                    student_id,
+                    rows[session_id, student_id]["scanned_at"],
+                )
+                for session_id, student_id in inserted
+            ],
+        )
+        await db.commit()
+    for teacher_id in set(teachers.values()):
+        analytics_results.bump(teacher_id)
+    if counts:
+        live.attendee_counts.publish(counts)
+    for session_id, student_id in rows:
+        seen_scans.add(session_id, student_id)
+    return inserted
+
+
+class AttendanceIngestor:
+    """Write-behind queue that commits attendance scans in batches.
+
+    Callers await ``submit`` and get back whether their row was inserted, but
+    the writer groups every scan that arrives within ``max_delay`` seconds (up
+    to ``max_batch`` rows) into a single transaction, so a scan storm costs
+    one fsync per batch instead of one per student. Each batch is written by
+    ``record_attendance``.
+    """
+
+    def __init__(self, max_batch: int, max_delay: float):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[PendingScan | None] | None = None
+        self._writer: asyncio.Task | None = None
+
+    def _ensure_writer(self):
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.create_task(self._run(), name="attendance-ingest")
+
+    async def submit(
+        self, session_id: int, student_id: int, scanned_at: datetime
+    ) -> bool:
+        """Enqueue a scan. Returns False if the student was already marked present."""
+        self._ensure_writer()
+        scan = PendingScan(session_id, student_id, scanned_at)
+        await self._queue.put(scan)
+        return await scan.result
+
+    async def _next_batch(self) -> tuple[list[PendingScan], bool]:
+        """Collect scans until the batch is full or the delay elapses.
+
+        Returns the batch and whether the shutdown sentinel was reached.
+        """
+        loop = asyncio.get_running_loop()
+        scan = await self._queue.get()
+        if scan is None:
+            return [], True
+        batch = [scan]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                scan = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if scan is None:
+                return batch, True
+            batch.append(scan)
+        return batch, False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: list[PendingScan]):
+        try:
+            inserted = await record_attendance(
+                [(scan.session_id, scan.student_id, scan.scanned_at) for scan in batch]
+            )
+        except Exception as e:
+            logging.exception(f"Error writing attendance batch: {e}")
+            for scan in batch:
+                if not scan.result.done():
+                    scan.result.set_exception(e)
+            return
+        for scan in batch:
+            key = (scan.session_id, scan.student_id)
+            if not scan.result.done():
+                scan.result.set_result(key in inserted)
+            inserted.discard(key)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """Run the writer for the app's lifetime and flush pending scans on shutdown."""
+        self._ensure_writer()
+        try:
+            yield
+        finally:
+            await self.flush()
+
+    async def flush(self):
+        """Write every queued scan and stop the writer."""
+        if self._writer is None or self._writer.done():
+            return
+        await self._queue.put(None)
+        await self._writer
+        self._writer = None
+
+
+ingestor = AttendanceIngestor(
+    max_batch=rxconfig.INGEST_MAX_BATCH,
+    max_delay=rxconfig.INGEST_MAX_DELAY_MS / 1000,
+)
@@ -0,0 +1,59 @@
+import asyncio
+from reflex.utils.prerequisites import get_and_validate_app
+
+
+def client_connected(token: str) -> bool:
+    """Whether the tab behind a client token still has a websocket open here.
+
+    Reflex does not cancel background events when a tab goes away, so
+    long-running loops check this to stop on their own.
+    """
+    namespace = get_and_validate_app().app.event_namespace
+    return namespace is not None and token in namespace.token_to_sid
+
+
+class CountSubscription:
+    """Pending attendee-count changes for one dashboard client."""
+
+    def __init__(self, session_ids: set[int]):
+        self.session_ids = session_ids
+        self._pending: dict[int, int] = {}
+        self._ready = asyncio.Event()
+
+    def _offer(self, counts: dict[int, int]):
+        changed = {k: v for k, v in counts.items() if k in self.session_ids}
+        if changed:
+            self._pending.update(changed)
+            self._ready.set()
+
+    async def next(self, timeout: float) -> dict[int, int]:
+        """Wait up to ``timeout`` seconds and return every change since the last call."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self._ready.clear()
+        pending, self._pending = self._pending, {}
+        return pending
+
+
+class CountBroadcaster:
+    """Fan out committed attendee counts to the dashboards watching those sessions."""
+
+    def __init__(self):
+        self._subscriptions: set[CountSubscription] = set()
+
+    def subscribe(self, session_ids: set[int]) -> CountSubscription:
+        subscription = CountSubscription(session_ids)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: CountSubscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, counts: dict[int, int]):
+        for subscription in self._subscriptions:
+            subscription._offer(counts)
+
+
+attendee_counts = CountBroadcaster()
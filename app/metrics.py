@@ -0,0 +1,55 @@
+import logging
+
+DECODE_ENGINES = ("native", "worker", "inline")
+
+
+class DecodeMetrics:
+    """Fleet-wide QR decode timings, aggregated from scanner reports."""
+
+    def __init__(self):
+        self._engines = {
+            engine: {"count": 0, "found": 0, "total_ms": 0.0, "max_ms": 0.0}
+            for engine in DECODE_ENGINES
+        }
+        self.reports = 0
+
+    def record(self, report: dict):
+        """Merge one client's per-engine timings, ignoring anything malformed."""
+        if not isinstance(report, dict):
+            return
+        self.reports += 1
+        for engine, stats in report.items():
+            totals = self._engines.get(engine)
+            if totals is None or not isinstance(stats, dict):
+                continue
+            try:
+                count = max(0, int(stats["count"]))
+                found = min(count, max(0, int(stats["found"])))
+                total_ms = max(0.0, float(stats["total_ms"]))
+                max_ms = max(0.0, float(stats["max_ms"]))
+            except (KeyError, TypeError, ValueError) as e:
+                logging.warning(f"Ignoring malformed decode stats for {engine}: {e}")
+                continue
+            totals["count"] += count
+            totals["found"] += found
+            totals["total_ms"] += total_ms
+            totals["max_ms"] = max(totals["max_ms"], max_ms)
+
+    def stats(self) -> dict:
+        return {
+            "reports": self.reports,
+            "engines": {
+                engine: {
+                    "decodes": totals["count"],
+                    "found": totals["found"],
+                    "mean_ms": round(totals["total_ms"] / totals["count"], 2)
+                    if totals["count"]
+                    else 0.0,
+                    "max_ms": round(totals["max_ms"], 2),
+                }
+                for engine, totals in self._engines.items()
+            },
+        }
+
+
+decode_metrics = DecodeMetrics()
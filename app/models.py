@@ -1,5 +1,6 @@
 import reflex as rx
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from datetime import datetime, timezone
 
 
@@ -23,27 +24,55 @@ class User(SQLModel, table=True):
     full_name: str
     password_hash: str
     role: str
-    email: str | None = None
-    student_id: str | None = None
+    email: str | None = Field(default=None, index=True)
+    student_id: str | None = Field(default=None, index=True)
     created_at: datetime = Field(default_factory=get_utc_now)
 
 
 class Session(SQLModel, table=True):
     """Class session created by a teacher."""
 
+    __table_args__ = (
+        Index("ix_session_teacher_active", "teacher_id", "is_active"),
+        Index("ix_session_active_expires", "is_active", "expires_at"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     teacher_id: int
     course_name: str
     created_at: datetime = Field(default_factory=get_utc_now)
     expires_at: datetime
     is_active: bool = True
+    attendee_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
 
 class Attendance(SQLModel, table=True):
     """Attendance record for a student in a session."""
 
+    __table_args__ = (
+        Index("ux_attendance_session_student", "session_id", "student_id", unique=True),
+        Index("ix_attendance_student_history", "student_id", "scanned_at", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     session_id: int
     student_id: int
     scanned_at: datetime = Field(default_factory=get_utc_now)
-    status: str = "present"
\ No newline at end of file
+    status: str = "present"
+
+
+class AttendanceByDay(SQLModel, table=True):
+    """Scans per session and day, updated with every attendance insert."""
+
+    session_id: int = Field(primary_key=True)
+    day: str = Field(primary_key=True)
+    teacher_id: int
+    attendees: int = 0
+
+
+class AttendanceByStudent(SQLModel, table=True):
+    """Sessions each student attended per teacher, updated with every attendance insert."""
+
+    teacher_id: int = Field(primary_key=True)
+    student_id: int = Field(primary_key=True)
+    sessions_attended: int = 0
@@ -1,14 +1,13 @@
 import reflex as rx
 from app.components.layout import dashboard_layout
 from app.states.auth import AuthState
-from app.states.session import SessionState
+from app.states.session import SessionState, SessionSummary
 from app.states.attendance import AttendanceState
-from app.models import Session
 from app.components.qr_modal import qr_modal
 from app.components.scanner_modal import scanner_modal
 
 
-def session_card(session: Session) -> rx.Component:
+def session_card(session: SessionSummary) -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -53,9 +52,7 @@ def session_card(session: Session) -> rx.Component:
             rx.el.button(
                 rx.icon("qr-code", class_name="w-4 h-4 mr-2"),
                 "Show QR",
-                on_click=SessionState.show_qr_code(
-                    session.id, session.course_name, session.expires_at.to_string()
-                ),
+                on_click=SessionState.show_qr_code(session.id),
                 class_name="flex items-center justify-center flex-1 bg-violet-100 text-violet-700 py-2 rounded-lg hover:bg-violet-200 transition-colors font-medium text-sm",
             ),
             rx.el.button(
@@ -76,17 +73,16 @@ def teacher_dashboard() -> rx.Component:
             rx.el.h2(
                 "Create New Session", class_name="text-lg font-bold text-gray-800 mb-4"
             ),
-            rx.el.div(
+            rx.el.form(
                 rx.el.div(
                     rx.el.label(
                         "Course Name",
                         class_name="block text-sm font-medium text-gray-700 mb-1",
                     ),
                     rx.el.input(
+                        name="course_name",
                         placeholder="e.g. CS101 - Intro to Computer Science",
-                        on_change=SessionState.set_course_name,
                         class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500",
-                        default_value=SessionState.course_name,
                     ),
                     class_name="flex-1",
                 ),
@@ -102,8 +98,8 @@ def teacher_dashboard() -> rx.Component:
                         rx.el.option("60 Minutes", value="60"),
                         rx.el.option("90 Minutes", value="90"),
                         rx.el.option("120 Minutes", value="120"),
-                        value=SessionState.duration.to_string(),
-                        on_change=SessionState.set_duration,
+                        name="duration",
+                        default_value="60",
                         class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500",
                     ),
                     class_name="w-48",
@@ -111,9 +107,11 @@ def teacher_dashboard() -> rx.Component:
                 rx.el.button(
                     rx.icon("plus", class_name="w-5 h-5 mr-2"),
                     "Create & Start",
-                    on_click=SessionState.create_session,
+                    type="submit",
                     class_name="bg-violet-600 text-white px-6 py-2 rounded-lg hover:bg-violet-700 transition-all flex items-center font-semibold shadow-sm h-[42px] mt-6",
                 ),
+                on_submit=SessionState.create_session,
+                reset_on_submit=True,
                 class_name="flex flex-col md:flex-row gap-4 items-start",
             ),
             class_name="bg-white p-6 rounded-xl border border-gray-100 shadow-sm mb-8",
@@ -151,32 +149,56 @@ def teacher_dashboard() -> rx.Component:
             class_name="w-full",
         ),
         qr_modal(),
+        on_unmount=SessionState.stop_watching_attendee_counts,
         class_name="w-full",
     )
 
 
+HISTORY_SCROLL_SCRIPT = """
+window.historyScroll = {
+    observer: null,
+
+    // Click "Load more" whenever it scrolls near the bottom of the list.
+    watch: function() {
+        const button = document.getElementById("history-more");
+        const list = document.getElementById("history-list");
+        if (!button || !list) return;
+        if (this.observer) this.observer.disconnect();
+        this.observer = new IntersectionObserver((entries) => {
+            if (!entries.some(e => e.isIntersecting)) return;
+            button.click();
+            // Check again once the page has rendered, in case it did not fill the list.
+            setTimeout(() => {
+                if (this.observer && button.isConnected) {
+                    this.observer.unobserve(button);
+                    this.observer.observe(button);
+                }
+            }, 500);
+        }, { root: list, rootMargin: "200px" });
+        this.observer.observe(button);
+    },
+};
+"""
+
+
 def history_item(item: dict) -> rx.Component:
-    return rx.el.tr(
-        rx.el.td(
-            rx.el.div(
-                rx.el.p(item["course_name"], class_name="font-medium text-gray-900"),
-                rx.el.p(
-                    f"Session #{item['session_id']}", class_name="text-xs text-gray-500"
-                ),
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(item["course_name"], class_name="font-medium text-gray-900"),
+            rx.el.p(
+                f"Session #{item['session_id']}", class_name="text-xs text-gray-500"
             ),
-            class_name="px-6 py-4 whitespace-nowrap",
-        ),
-        rx.el.td(
-            item["scanned_at"],
-            class_name="px-6 py-4 whitespace-nowrap text-sm text-gray-500",
         ),
-        rx.el.td(
+        rx.el.p(item["scanned_at"], class_name="text-sm text-gray-500"),
+        rx.el.div(
             rx.el.span(
                 item["status"],
                 class_name="px-2 inline-flex text-xs leading-5 font-semibold rounded-full bg-green-100 text-green-800 capitalize",
             ),
-            class_name="px-6 py-4 whitespace-nowrap",
         ),
+        # Rows outside the viewport skip layout and paint entirely.
+        style={"content_visibility": "auto", "contain_intrinsic_size": "auto 72px"},
+        class_name="grid grid-cols-3 items-center gap-4 px-6 py-4 whitespace-nowrap",
     )
 
 
@@ -203,14 +225,27 @@ def student_dashboard() -> rx.Component:
                 class_name="flex justify-between items-center bg-white p-6 rounded-xl border border-gray-100 shadow-sm mb-8",
             ),
             rx.el.div(
+                scanner_modal(
+                    rx.el.button(
+                        rx.icon("scan", class_name="w-6 h-6 text-violet-600 mb-2"),
+                        rx.el.h3(
+                            "Scan QR Code", class_name="font-semibold text-gray-900"
+                        ),
+                        rx.el.p(
+                            "Mark your attendance now",
+                            class_name="text-sm text-gray-500",
+                        ),
+                        class_name="bg-white p-6 rounded-xl border border-gray-100 shadow-sm hover:shadow-md transition-shadow cursor-pointer text-left",
+                    )
+                ),
                 rx.el.button(
-                    rx.icon("scan", class_name="w-6 h-6 text-violet-600 mb-2"),
-                    rx.el.h3("Scan QR Code", class_name="font-semibold text-gray-900"),
-                    rx.el.p(
-                        "Mark your attendance now", class_name="text-sm text-gray-500"
+                    id="scan-replay",
+                    on_click=rx.call_script(
+                        "window.scanQueue.pending()",
+                        callback=AttendanceState.replay_scans,
                     ),
-                    on_click=AttendanceState.toggle_scanner(True),
-                    class_name="bg-white p-6 rounded-xl border border-gray-100 shadow-sm hover:shadow-md transition-shadow cursor-pointer text-left",
+                    on_mount=rx.call_script("window.scanQueue.flush(true)"),
+                    class_name="hidden",
                 ),
                 class_name="grid grid-cols-1 gap-6 mb-8",
             ),
@@ -220,29 +255,27 @@ def student_dashboard() -> rx.Component:
                     class_name="text-lg font-bold text-gray-800 mb-4",
                 ),
                 rx.el.div(
-                    rx.el.table(
-                        rx.el.thead(
-                            rx.el.tr(
-                                rx.el.th(
-                                    "Course",
-                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                ),
-                                rx.el.th(
-                                    "Date & Time",
-                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                ),
-                                rx.el.th(
-                                    "Status",
-                                    class_name="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider",
-                                ),
+                    rx.script(HISTORY_SCROLL_SCRIPT),
+                    rx.el.div(
+                        rx.el.p("Course"),
+                        rx.el.p("Date & Time"),
+                        rx.el.p("Status"),
+                        class_name="grid grid-cols-3 gap-4 px-6 py-3 bg-gray-50 text-left text-xs font-medium text-gray-500 uppercase tracking-wider border-b border-gray-200",
+                    ),
+                    rx.el.div(
+                        rx.foreach(AttendanceState.history, history_item),
+                        rx.cond(
+                            AttendanceState.has_more_history,
+                            rx.el.button(
+                                "Load more",
+                                id="history-more",
+                                on_click=AttendanceState.load_more_history,
+                                on_mount=rx.call_script("window.historyScroll.watch()"),
+                                class_name="w-full py-3 text-sm text-violet-600 hover:bg-violet-50",
                             ),
-                            class_name="bg-gray-50",
-                        ),
-                        rx.el.tbody(
-                            rx.foreach(AttendanceState.history, history_item),
-                            class_name="bg-white divide-y divide-gray-200",
                         ),
-                        class_name="min-w-full divide-y divide-gray-200",
+                        id="history-list",
+                        class_name="bg-white divide-y divide-gray-200 max-h-[32rem] overflow-y-auto",
                     ),
                     class_name="overflow-hidden rounded-lg shadow-sm border border-gray-200 overflow-x-auto",
                 ),
@@ -250,7 +283,6 @@ def student_dashboard() -> rx.Component:
             ),
             class_name="flex flex-col",
         ),
-        scanner_modal(),
         class_name="w-full",
     )
 
@@ -270,4 +302,4 @@ def dashboard_content() -> rx.Component:
 
 
 def dashboard_page() -> rx.Component:
-    return dashboard_layout(dashboard_content())
\ No newline at end of file
+    return dashboard_layout(dashboard_content())
@@ -0,0 +1,135 @@
+import reflex as rx
+from app.components.layout import dashboard_layout
+from app.components.scanner_modal import scanner_viewport
+from app.states.kiosk import KioskState
+from app.states.session import SessionState
+
+KIOSK_SCRIPT = """
+window.kiosk = {
+    // Badge reads are gathered for FLUSH_MS and sent as one form submit, so a
+    // queue of students costs one event per burst instead of one per badge.
+    FLUSH_MS: 50,
+    MAX_BATCH: 50,
+    pending: [],
+    timer: null,
+
+    push: function(data) {
+        const statusMsg = document.getElementById("qr-status");
+        if (statusMsg) {
+            statusMsg.innerText = "Badge read. Next, please.";
+            statusMsg.className = "text-xs text-emerald-600 mb-2 text-center font-bold";
+        }
+        this.pending.push(data);
+        if (!this.timer) this.timer = setTimeout(() => this.flush(), this.FLUSH_MS);
+    },
+
+    flush: function() {
+        this.timer = null;
+        const form = document.getElementById("kiosk-form");
+        const input = document.getElementById("kiosk-badges");
+        if (!form || !input || !this.pending.length) return;
+        input.value = JSON.stringify(this.pending.splice(0, this.MAX_BATCH));
+        form.requestSubmit();
+        if (this.pending.length) this.timer = setTimeout(() => this.flush(), this.FLUSH_MS);
+    },
+};
+"""
+
+
+def recent_item(item: dict) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(item["name"], class_name="font-medium text-gray-900"),
+            rx.el.p(item["status"], class_name="text-sm text-gray-500"),
+        ),
+        rx.el.span(item["time"], class_name="text-xs text-gray-400 font-mono"),
+        class_name="flex justify-between items-center px-4 py-3",
+    )
+
+
+def kiosk_scanner() -> rx.Component:
+    return rx.el.div(
+        rx.script(KIOSK_SCRIPT),
+        scanner_viewport(),
+        rx.el.form(
+            rx.el.input(id="kiosk-badges", name="badges", type="hidden"),
+            id="kiosk-form",
+            on_submit=KioskState.record_badges,
+        ),
+        on_mount=rx.call_script(
+            "window.qrScanner.init({onDetect: (data) => window.kiosk.push(data)})"
+        ),
+        on_unmount=rx.call_script("window.qrScanner.stop()"),
+        class_name="bg-white p-6 rounded-xl border border-gray-100 shadow-sm",
+    )
+
+
+def kiosk_content() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h1("Kiosk Mode", class_name="text-2xl font-bold text-gray-900"),
+                rx.el.p(
+                    "Students hold their badge up to this device to be marked present.",
+                    class_name="text-gray-500 mt-1",
+                ),
+            ),
+            rx.el.button(
+                rx.icon("printer", class_name="w-4 h-4 mr-2"),
+                rx.cond(
+                    KioskState.badges_running,
+                    f"Generating badges... {KioskState.badges_progress}%",
+                    "Print student badges",
+                ),
+                on_click=KioskState.generate_badges,
+                disabled=KioskState.badges_running,
+                class_name="flex items-center bg-violet-600 text-white font-semibold py-2 px-4 rounded-lg hover:bg-violet-700 transition duration-200 disabled:opacity-60",
+            ),
+            class_name="flex justify-between items-start mb-8",
+        ),
+        rx.el.select(
+            rx.el.option("Select a session", value=""),
+            rx.foreach(
+                SessionState.active_sessions,
+                lambda session: rx.el.option(
+                    session.course_name, value=session.id.to_string()
+                ),
+            ),
+            on_change=KioskState.select_session,
+            class_name="w-full px-4 py-3 rounded-lg border border-gray-300 mb-6",
+        ),
+        rx.cond(
+            KioskState.session_id > 0,
+            rx.el.div(
+                kiosk_scanner(),
+                rx.el.div(
+                    rx.el.div(
+                        rx.el.h3(
+                            KioskState.session_title,
+                            class_name="text-lg font-bold text-gray-800",
+                        ),
+                        rx.el.p(
+                            f"{KioskState.marked_count} marked at this kiosk",
+                            class_name="text-sm text-gray-500",
+                        ),
+                        class_name="px-4 py-3 border-b border-gray-100",
+                    ),
+                    rx.el.div(
+                        rx.foreach(KioskState.recent, recent_item),
+                        class_name="divide-y divide-gray-100",
+                    ),
+                    class_name="bg-white rounded-xl border border-gray-100 shadow-sm",
+                ),
+                class_name="grid grid-cols-1 lg:grid-cols-2 gap-6",
+            ),
+            rx.el.p(
+                "Choose one of your active sessions to start scanning badges.",
+                class_name="text-gray-500",
+            ),
+        ),
+        class_name="p-8 max-w-6xl mx-auto",
+    )
+
+
+def kiosk_page() -> rx.Component:
+    return dashboard_layout(kiosk_content())
@@ -5,7 +5,7 @@ from app.components.layout import auth_layout
 
 def teacher_login_page() -> rx.Component:
     return auth_layout(
-        rx.el.div(
+        rx.el.form(
             rx.el.div(
                 rx.el.label(
                     "Email Address",
@@ -13,7 +13,7 @@ def teacher_login_page() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="teacher@school.com",
-                    on_change=AuthState.set_email_input,
+                    name="email",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -26,14 +26,14 @@ def teacher_login_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_password_input,
+                    name="password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-6",
             ),
             rx.el.button(
                 "Sign In as Teacher",
-                on_click=AuthState.login_teacher,
+                type="submit",
                 class_name="w-full bg-violet-600 text-white font-medium py-2.5 rounded-lg hover:bg-violet-700 transition-colors shadow-sm hover:shadow-md",
             ),
             rx.el.div(
@@ -45,6 +45,7 @@ def teacher_login_page() -> rx.Component:
                 ),
                 class_name="text-center mt-4 text-sm text-gray-600",
             ),
+            on_submit=AuthState.login_teacher,
             class_name="flex flex-col",
         ),
         title="Teacher Login",
@@ -53,7 +54,7 @@ def teacher_login_page() -> rx.Component:
 
 def student_login_page() -> rx.Component:
     return auth_layout(
-        rx.el.div(
+        rx.el.form(
             rx.el.div(
                 rx.el.label(
                     "Student ID",
@@ -61,7 +62,7 @@ def student_login_page() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="S12345",
-                    on_change=AuthState.set_student_id_input,
+                    name="student_id",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -74,14 +75,14 @@ def student_login_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_password_input,
+                    name="password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-6",
             ),
             rx.el.button(
                 "Sign In as Student",
-                on_click=AuthState.login_student,
+                type="submit",
                 class_name="w-full bg-emerald-600 text-white font-medium py-2.5 rounded-lg hover:bg-emerald-700 transition-colors shadow-sm hover:shadow-md",
             ),
             rx.el.div(
@@ -93,7 +94,8 @@ def student_login_page() -> rx.Component:
                 ),
                 class_name="text-center mt-4 text-sm text-gray-600",
             ),
+            on_submit=AuthState.login_student,
             class_name="flex flex-col",
         ),
         title="Student Login",
-    )
\ No newline at end of file
+    )
@@ -5,7 +5,7 @@ from app.components.layout import auth_layout
 
 def teacher_registration_page() -> rx.Component:
     return auth_layout(
-        rx.el.div(
+        rx.el.form(
             rx.el.div(
                 rx.el.label(
                     "Full Name",
@@ -13,7 +13,7 @@ def teacher_registration_page() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="Prof. John Smith",
-                    on_change=AuthState.set_reg_full_name,
+                    name="full_name",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -26,7 +26,7 @@ def teacher_registration_page() -> rx.Component:
                 rx.el.input(
                     type="email",
                     placeholder="teacher@school.com",
-                    on_change=AuthState.set_reg_email,
+                    name="email",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -39,7 +39,7 @@ def teacher_registration_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_reg_password,
+                    name="password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -52,14 +52,14 @@ def teacher_registration_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_reg_confirm_password,
+                    name="confirm_password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-6",
             ),
             rx.el.button(
                 "Create Teacher Account",
-                on_click=AuthState.register_teacher,
+                type="submit",
                 class_name="w-full bg-violet-600 text-white font-medium py-2.5 rounded-lg hover:bg-violet-700 transition-colors shadow-sm hover:shadow-md",
             ),
             rx.el.div(
@@ -71,6 +71,7 @@ def teacher_registration_page() -> rx.Component:
                 ),
                 class_name="text-center mt-4 text-sm text-gray-600",
             ),
+            on_submit=AuthState.register_teacher,
             class_name="flex flex-col",
         ),
         title="Teacher Registration",
@@ -79,7 +80,7 @@ def teacher_registration_page() -> rx.Component:
 
 def student_registration_page() -> rx.Component:
     return auth_layout(
-        rx.el.div(
+        rx.el.form(
             rx.el.div(
                 rx.el.label(
                     "Full Name",
@@ -87,7 +88,7 @@ def student_registration_page() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="John Doe",
-                    on_change=AuthState.set_reg_full_name,
+                    name="full_name",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -99,7 +100,7 @@ def student_registration_page() -> rx.Component:
                 ),
                 rx.el.input(
                     placeholder="S12345",
-                    on_change=AuthState.set_reg_student_id,
+                    name="student_id",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -112,7 +113,7 @@ def student_registration_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_reg_password,
+                    name="password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-4",
@@ -125,14 +126,14 @@ def student_registration_page() -> rx.Component:
                 rx.el.input(
                     type="password",
                     placeholder="••••••••",
-                    on_change=AuthState.set_reg_confirm_password,
+                    name="confirm_password",
                     class_name="w-full px-4 py-2 rounded-lg border border-gray-300 focus:ring-2 focus:ring-violet-500 focus:border-violet-500 outline-none transition-all",
                 ),
                 class_name="mb-6",
             ),
             rx.el.button(
                 "Create Student Account",
-                on_click=AuthState.register_student,
+                type="submit",
                 class_name="w-full bg-emerald-600 text-white font-medium py-2.5 rounded-lg hover:bg-emerald-700 transition-colors shadow-sm hover:shadow-md",
             ),
             rx.el.div(
@@ -144,7 +145,8 @@ def student_registration_page() -> rx.Component:
                 ),
                 class_name="text-center mt-4 text-sm text-gray-600",
             ),
+            on_submit=AuthState.register_student,
             class_name="flex flex-col",
         ),
         title="Student Registration",
-    )
\ No newline at end of file
+    )
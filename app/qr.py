@@ -0,0 +1,178 @@
+import gzip
+import hashlib
+import io
+from collections import OrderedDict
+from pathlib import Path
+import qrcode
+import reflex as rx
+from reflex.config import get_config
+from starlette.requests import Request
+from starlette.responses import Response
+import rxconfig
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _make_qr(payload: str) -> qrcode.QRCode:
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr
+
+
+def render_png(payload: str) -> bytes:
+    img = _make_qr(payload).make_image(fill_color="black", back_color="white")
+    buffered = io.BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def module_runs(payload: str) -> tuple[int, list[tuple[int, int, int]]]:
+    """Return the matrix size and its dark runs as (row, start, length)."""
+    matrix = _make_qr(payload).get_matrix()
+    size = len(matrix)
+    runs = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            runs.append((y, start, x - start))
+    return size, runs
+
+
+def render_svg(payload: str) -> bytes:
+    """Render the module matrix as a single stroked SVG path.
+
+    Each row's runs of dark modules become one horizontal segment, and moves
+    within a row are relative. The markup is about twice the PNG's size, but
+    it is served gzipped, which brings it to roughly 70% of the PNG.
+    """
+    size, runs = module_runs(payload)
+    parts = []
+    previous_row, cursor = None, 0
+    for y, start, length in runs:
+        if y != previous_row:
+            parts.append(f"M{start} {y}.5h{length}")
+        else:
+            parts.append(f"m{start - cursor} 0h{length}")
+        previous_row, cursor = y, start + length
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" '
+        f'shape-rendering="crispEdges"><rect width="{size}" height="{size}" '
+        f'fill="#fff"/><path stroke="#000" d="{"".join(parts)}"/></svg>'
+    ).encode("utf-8")
+
+
+RENDERERS = {
+    "png": (render_png, "image/png"),
+    "svg": (render_svg, "image/svg+xml"),
+}
+# Formats worth compressing on the way out; PNG already is.
+GZIP_FORMATS = {"svg"}
+
+
+class QRImageCache:
+    """Render each QR payload once and keep the image in memory and on disk.
+
+    Images are addressed by a hash of their payload and format, so the key
+    doubles as a strong ETag and the URL never changes for a given payload.
+    Both tiers evict least-recently-used entries past their limits.
+    """
+
+    def __init__(
+        self, directory: Path, memory_size: int, disk_size: int, image_format: str
+    ):
+        self.directory = directory
+        self.format = image_format
+        self.render, self.media_type = RENDERERS[image_format]
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, payload: str) -> str:
+        digest = hashlib.sha256(f"{self.format}:{payload}".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def _remember(self, key: str, image: bytes):
+        self._images[key] = image
+        self._images.move_to_end(key)
+        while len(self._images) > self.memory_size:
+            self._images.popitem(last=False)
+
+    def _store(self, key: str, image: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.{self.format}").write_bytes(image)
+        files = sorted(
+            self.directory.glob(f"*.{self.format}"), key=lambda p: p.stat().st_mtime
+        )
+        for stale in files[: max(0, len(files) - self.disk_size)]:
+            stale.unlink(missing_ok=True)
+
+    def get(self, key: str) -> bytes | None:
+        """Look up a rendered image by key, falling back to the disk tier."""
+        image = self._images.get(key)
+        if image is None:
+            path = self.directory / f"{key}.{self.format}"
+            if not path.exists():
+                return None
+            image = path.read_bytes()
+        self._remember(key, image)
+        return image
+
+    def ensure(self, payload: str) -> str:
+        """Render the payload if it is not cached yet and return its key."""
+        key = self.key_for(payload)
+        if self.get(key) is not None:
+            self.hits += 1
+            return key
+        self.misses += 1
+        image = self.render(payload)
+        self._store(key, image)
+        self._remember(key, image)
+        return key
+
+    def url_for(self, payload: str) -> str:
+        return f"{get_config().api_url}/qr/{self.ensure(payload)}.{self.format}"
+
+
+qr_images = QRImageCache(
+    directory=rx.get_upload_dir() / "qr",
+    memory_size=rxconfig.QR_CACHE_SIZE,
+    disk_size=rxconfig.QR_DISK_CACHE_SIZE,
+    image_format=rxconfig.QR_RENDER_MODE,
+)
+
+
+async def serve_qr_image(request: Request) -> Response:
+    key, _, extension = request.path_params["filename"].partition(".")
+    if len(key) != 32 or not key.isalnum() or extension != qr_images.format:
+        return Response(status_code=404)
+    gzipped = qr_images.format in GZIP_FORMATS and "gzip" in request.headers.get(
+        "accept-encoding", ""
+    )
+    # Each encoding is its own representation, so it gets its own ETag.
+    etag = f'"{key}-gzip"' if gzipped else f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if qr_images.format in GZIP_FORMATS:
+        headers["Vary"] = "Accept-Encoding"
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    image = qr_images.get(key)
+    if image is None:
+        return Response(status_code=404)
+    if gzipped:
+        image = gzip.compress(image)
+        headers["Content-Encoding"] = "gzip"
+    return Response(image, media_type=qr_images.media_type, headers=headers)
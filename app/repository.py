@@ -0,0 +1,316 @@
+from datetime import datetime, timezone
+from sqlalchemy import case, tuple_
+from sqlmodel import func, select, desc, update
+from app.database import get_async_session
+from app.models import (
+    User,
+    Session,
+    Attendance,
+    AttendanceByDay,
+    AttendanceByStudent,
+    ensure_timezone,
+)
+
+
+async def get_user_by_email(email: str) -> User | None:
+    async with get_async_session() as db:
+        return (await db.exec(select(User).where(User.email == email))).first()
+
+
+async def get_user_by_student_id(student_id: str) -> User | None:
+    async with get_async_session() as db:
+        return (
+            await db.exec(select(User).where(User.student_id == student_id))
+        ).first()
+
+
+async def get_student_ids(student_numbers: list[str]) -> dict[str, int]:
+    """Map student ID numbers to user ids, skipping unknown numbers."""
+    async with get_async_session() as db:
+        return dict(
+            (
+                await db.exec(
+                    select(User.student_id, User.id)
+                    .where(User.role == "student")
+                    .where(User.student_id.in_(student_numbers))
+                )
+            ).all()
+        )
+
+
+async def get_student_names(user_ids: list[int]) -> dict[int, str]:
+    async with get_async_session() as db:
+        return dict(
+            (
+                await db.exec(
+                    select(User.id, User.full_name)
+                    .where(User.role == "student")
+                    .where(User.id.in_(user_ids))
+                )
+            ).all()
+        )
+
+
+async def list_students() -> list[tuple[int, str, str | None]]:
+    """Every student as (user id, full name, student ID number), by name."""
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(User.id, User.full_name, User.student_id)
+                .where(User.role == "student")
+                .order_by(User.full_name, User.id)
+            )
+        ).all()
+
+
+async def has_users() -> bool:
+    async with get_async_session() as db:
+        return (await db.exec(select(User.id).limit(1))).first() is not None
+
+
+async def add_users(*users: User):
+    async with get_async_session() as db:
+        db.add_all(users)
+        await db.commit()
+
+
+async def update_password_hash(user_id: int, password_hash: str):
+    async with get_async_session() as db:
+        user = await db.get(User, user_id)
+        if user:
+            user.password_hash = password_hash
+            db.add(user)
+            await db.commit()
+
+
+async def get_class_session(session_id: int) -> Session | None:
+    async with get_async_session() as db:
+        return await db.get(Session, session_id)
+
+
+async def list_student_history(
+    student_id: int, before: tuple[datetime, int] | None, limit: int
+) -> list[tuple[int, datetime, str, int, str]]:
+    """One page of a student's attendance, newest first.
+
+    Rows are (attendance id, scanned_at, status, session id, course name).
+    Pass the (scanned_at, id) of the last row seen as ``before`` for the next
+    page; the composite index makes each page a range scan.
+    """
+    query = (
+        select(
+            Attendance.id,
+            Attendance.scanned_at,
+            Attendance.status,
+            Session.id,
+            Session.course_name,
+        )
+        .join(Session, Attendance.session_id == Session.id)
+        .where(Attendance.student_id == student_id)
+        .order_by(desc(Attendance.scanned_at), desc(Attendance.id))
+        .limit(limit)
+    )
+    if before is not None:
+        query = query.where(
+            tuple_(Attendance.scanned_at, Attendance.id) < tuple_(*before)
+        )
+    async with get_async_session() as db:
+        return (await db.exec(query)).all()
+
+
+async def count_student_history(student_id: int) -> int:
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(func.count()).where(Attendance.student_id == student_id)
+            )
+        ).one()
+
+
+async def expire_sessions(now: datetime) -> list[tuple[int, int]]:
+    """Deactivate every session past its expiry.
+
+    Returns the (id, teacher_id) of each expired session.
+    """
+    async with get_async_session() as db:
+        result = await db.exec(
+            update(Session)
+            .where(Session.is_active == True)
+            .where(Session.expires_at < now)
+            .values(is_active=False)
+            .returning(Session.id, Session.teacher_id)
+        )
+        expired = result.all()
+        await db.commit()
+        return expired
+
+
+async def list_active_sessions(teacher_id: int, now: datetime) -> list[Session]:
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(Session)
+                .where(Session.teacher_id == teacher_id)
+                .where(Session.is_active == True)
+                .where(Session.expires_at >= now)
+                .order_by(desc(Session.created_at))
+            )
+        ).all()
+
+
+async def list_all_active_sessions(now: datetime) -> list[Session]:
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(Session)
+                .where(Session.is_active == True)
+                .where(Session.expires_at >= now)
+            )
+        ).all()
+
+
+async def create_class_session(session: Session) -> Session:
+    async with get_async_session() as db:
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+        return session
+
+
+async def end_class_session(session_id: int) -> int | None:
+    """Deactivate a session and cut its expiry short to now.
+
+    Returns its teacher's id, or None if there is no such session.
+    """
+    async with get_async_session() as db:
+        s = await db.get(Session, session_id)
+        if s:
+            s.is_active = False
+            s.expires_at = min(
+                ensure_timezone(s.expires_at), datetime.now(timezone.utc)
+            )
+            db.add(s)
+            await db.commit()
+            return s.teacher_id
+        return None
+
+
+async def list_teacher_sessions(
+    teacher_id: int,
+    session_id: int | None = None,
+    created_after: datetime | None = None,
+) -> list[Session]:
+    query = select(Session).where(Session.teacher_id == teacher_id)
+    if session_id is not None:
+        query = query.where(Session.id == session_id)
+    if created_after is not None:
+        query = query.where(Session.created_at >= created_after)
+    async with get_async_session() as db:
+        return (await db.exec(query.order_by(Session.id))).all()
+
+
+async def list_session_student_ids(session_id: int) -> list[int]:
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(Attendance.student_id).where(Attendance.session_id == session_id)
+            )
+        ).all()
+
+
+def _teacher_sessions(
+    teacher_id: int, session_id: int | None, created_after: datetime | None
+) -> list:
+    clauses = [Session.teacher_id == teacher_id]
+    if session_id is not None:
+        clauses.append(Session.id == session_id)
+    if created_after is not None:
+        clauses.append(Session.created_at >= created_after)
+    return clauses
+
+
+async def count_session_attendance(
+    teacher_id: int,
+    session_id: int | None = None,
+    created_after: datetime | None = None,
+) -> list[tuple[int, str, bool, int]]:
+    """(id, course_name, is_active, attendees) for each of a teacher's sessions."""
+    query = (
+        select(
+            Session.id, Session.course_name, Session.is_active, Session.attendee_count
+        )
+        .where(*_teacher_sessions(teacher_id, session_id, created_after))
+        .order_by(Session.id)
+    )
+    async with get_async_session() as db:
+        return (await db.exec(query)).all()
+
+
+async def count_daily_attendance(
+    teacher_id: int,
+    session_id: int | None = None,
+    created_after: datetime | None = None,
+) -> list[tuple[str, int]]:
+    """(YYYY-MM-DD, scans) for each day with attendance in a teacher's sessions."""
+    query = (
+        select(AttendanceByDay.day, func.sum(AttendanceByDay.attendees))
+        .join(Session, Session.id == AttendanceByDay.session_id)
+        .where(*_teacher_sessions(teacher_id, session_id, created_after))
+        .group_by(AttendanceByDay.day)
+        .order_by(AttendanceByDay.day)
+    )
+    async with get_async_session() as db:
+        return (await db.exec(query)).all()
+
+
+async def count_participation(
+    teacher_id: int,
+    total_sessions: int,
+    session_id: int | None = None,
+    created_after: datetime | None = None,
+) -> dict[str, int]:
+    """Students per participation band, out of ``total_sessions`` sessions.
+
+    High is at least 75% of the sessions attended, Medium at least 40%. Over
+    all of a teacher's sessions this reads the per-student rollup; a filtered
+    subset is counted from the attendance rows.
+    """
+    if session_id is None and created_after is None:
+        per_student = (
+            select(AttendanceByStudent.sessions_attended.label("attended"))
+            .where(AttendanceByStudent.teacher_id == teacher_id)
+            .subquery()
+        )
+    else:
+        per_student = (
+            select(func.count().label("attended"))
+            .select_from(Attendance)
+            .join(Session, Session.id == Attendance.session_id)
+            .where(*_teacher_sessions(teacher_id, session_id, created_after))
+            .group_by(Attendance.student_id)
+            .subquery()
+        )
+    attended = per_student.c.attended
+    band = case(
+        (attended * 4 >= total_sessions * 3, "High"),
+        (attended * 5 >= total_sessions * 2, "Medium"),
+        else_="Low",
+    )
+    async with get_async_session() as db:
+        rows = (await db.exec(select(band, func.count()).group_by(band))).all()
+    return dict(rows)
+
+
+async def list_attendance_with_students(
+    session_ids: list[int],
+) -> list[tuple[Attendance, User]]:
+    if not session_ids:
+        return []
+    async with get_async_session() as db:
+        return (
+            await db.exec(
+                select(Attendance, User)
+                .where(Attendance.session_id.in_(session_ids))
+                .where(Attendance.student_id == User.id)
+            )
+        ).all()
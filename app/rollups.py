@@ -0,0 +1,117 @@
+"""Attendance rollups for the analytics dashboard.
+
+Rebuild them from the attendance table, from the repository root:
+
+    python -m app.rollups
+"""
+
+import argparse
+import time
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import Connection
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Attendance, AttendanceByDay, AttendanceByStudent, Session
+
+
+async def add_attendance(db: AsyncSession, scans: list[tuple[int, int, int, datetime]]):
+    """Count newly inserted (teacher_id, session_id, student_id, scanned_at) rows.
+
+    Runs in the transaction that inserted them, so the rollups commit or roll
+    back together with the attendance rows.
+    """
+    if not scans:
+        return
+    days = Counter(
+        (teacher_id, session_id, scanned_at.strftime("%Y-%m-%d"))
+        for teacher_id, session_id, _, scanned_at in scans
+    )
+    by_day = insert(AttendanceByDay).values(
+        [
+            {
+                "teacher_id": teacher_id,
+                "session_id": session_id,
+                "day": day,
+                "attendees": n,
+            }
+            for (teacher_id, session_id, day), n in days.items()
+        ]
+    )
+    await db.exec(
+        by_day.on_conflict_do_update(
+            index_elements=["session_id", "day"],
+            set_={"attendees": AttendanceByDay.attendees + by_day.excluded.attendees},
+        )
+    )
+    students = Counter(
+        (teacher_id, student_id) for teacher_id, _, student_id, _ in scans
+    )
+    by_student = insert(AttendanceByStudent).values(
+        [
+            {"teacher_id": teacher_id, "student_id": student_id, "sessions_attended": n}
+            for (teacher_id, student_id), n in students.items()
+        ]
+    )
+    await db.exec(
+        by_student.on_conflict_do_update(
+            index_elements=["teacher_id", "student_id"],
+            set_={
+                "sessions_attended": AttendanceByStudent.sessions_attended
+                + by_student.excluded.sessions_attended
+            },
+        )
+    )
+
+
+def rebuild_rollups(conn: Connection):
+    """Recompute the rollups and ``Session.attendee_count`` from the attendance table."""
+    conn.execute(delete(AttendanceByDay))
+    conn.execute(delete(AttendanceByStudent))
+    day = func.date(Attendance.scanned_at)
+    conn.execute(
+        insert(AttendanceByDay).from_select(
+            ["session_id", "day", "teacher_id", "attendees"],
+            select(Attendance.session_id, day, Session.teacher_id, func.count())
+            .join(Session, Session.id == Attendance.session_id)
+            .group_by(Attendance.session_id, day),
+        )
+    )
+    conn.execute(
+        insert(AttendanceByStudent).from_select(
+            ["teacher_id", "student_id", "sessions_attended"],
+            select(Session.teacher_id, Attendance.student_id, func.count())
+            .join(Session, Session.id == Attendance.session_id)
+            .group_by(Session.teacher_id, Attendance.student_id),
+        )
+    )
+    conn.execute(
+        update(Session).values(
+            attendee_count=select(func.count())
+            .where(Attendance.session_id == Session.id)
+            .scalar_subquery()
+        )
+    )
+
+
+def main():
+    from app.database import get_engine, initialize_db
+
+    argparse.ArgumentParser(description=__doc__).parse_args()
+    initialize_db()
+    start = time.perf_counter()
+    with get_engine().begin() as conn:
+        rebuild_rollups(conn)
+        days = conn.execute(select(func.count()).select_from(AttendanceByDay)).scalar()
+        students = conn.execute(
+            select(func.count()).select_from(AttendanceByStudent)
+        ).scalar()
+    print(
+        f"Rebuilt {days} session-day and {students} teacher-student rollups "
+        f"in {time.perf_counter() - start:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
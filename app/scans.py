@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+import rxconfig
+from app import repository
+from app.cache import CachedSession, active_sessions, replayed_scans, seen_scans
+from app.ingest import ingestor, record_attendance
+from app.tokens import TokenError, verify_session_token
+
+
+class ScanError(Exception):
+    """A scan cannot be recorded; the message is safe to show to the student."""
+
+
+async def resolve_scan_session(
+    token: str, scanned_at: datetime, queued: bool
+) -> CachedSession:
+    """Verify a token as of ``scanned_at`` and return the session it admits to.
+
+    ``queued`` scans were captured earlier and are being delivered late, from
+    an offline device queue or a kiosk batch. They may arrive after the
+    session closed, as long as they were taken before it did.
+    """
+    now = datetime.now(timezone.utc)
+    if queued and now - scanned_at > timedelta(
+        seconds=rxconfig.OFFLINE_SCAN_MAX_AGE_SECONDS
+    ):
+        raise ScanError("This offline scan expired.")
+    try:
+        session_id = verify_session_token(token, now=scanned_at)
+    except TokenError as e:
+        raise ScanError(str(e)) from e
+    session = await active_sessions.get(session_id)
+    if not session:
+        raise ScanError("Session not found.")
+    # Ending a session early moves its expires_at to the end time, so a late
+    # scan is only accepted if it was taken before the session closed.
+    if not session.is_active and (not queued or scanned_at >= session.expires_at):
+        raise ScanError("This session has ended.")
+    return session
+
+
+async def mark_present(
+    session: CachedSession, student_id: int, scanned_at: datetime
+) -> bool:
+    """Submit a verified scan to the ingestor and return whether it was new.
+
+    Repeats in an active session are answered from the seen-set without
+    waiting on the writer. Raises ScanError if the write failed; the scan
+    can be retried.
+    """
+    if session.is_active and await seen_scans.contains(session.id, student_id):
+        return False
+    try:
+        return await ingestor.submit(session.id, student_id, scanned_at)
+    except Exception as e:
+        raise ScanError("Could not record attendance. Please try again.") from e
+
+
+def _parse_record(record, skew: float) -> tuple[str, str, str, datetime]:
+    try:
+        return (
+            str(record["key"]),
+            str(record["token"]),
+            str(record["student_id"]),
+            datetime.fromtimestamp(float(record["scanned_at"]) + skew, timezone.utc),
+        )
+    except (KeyError, TypeError, ValueError, OverflowError, OSError) as e:
+        raise ScanError("Malformed record.") from e
+
+
+async def record_scan_batch(records: list, sent_at: float | None = None) -> list[dict]:
+    """Validate a kiosk or gateway batch and insert its scans in one transaction.
+
+    Each record holds an idempotency ``key``, a session ``token``, the
+    student's ``student_id`` number and the device's ``scanned_at`` epoch
+    seconds. When the device also sends its clock as ``sent_at``, timestamps
+    are shifted by the difference to the server clock. Returns one
+    ``{"key", "status", "message"}`` result per record, in order, where
+    status is "inserted", "duplicate" or "rejected". A record that fails
+    validation is rejected on its own; only storage errors propagate.
+    """
+    now = datetime.now(timezone.utc)
+    skew = now.timestamp() - sent_at if sent_at is not None else 0.0
+    results: list[dict | None] = [None] * len(records)
+
+    def settle(index: int, key: str, status: str, message: str):
+        results[index] = {"key": key, "status": status, "message": message}
+        replayed_scans.put(f"batch:{key}", (status, message))
+
+    accepted = []
+    for index, record in enumerate(records):
+        try:
+            key, token, student_number, scanned_at = _parse_record(record, skew)
+        except ScanError as e:
+            key = record.get("key") if isinstance(record, dict) else None
+            results[index] = {"key": key, "status": "rejected", "message": str(e)}
+            continue
+        settled = replayed_scans.get(f"batch:{key}")
+        if settled is not None:
+            results[index] = {"key": key, "status": settled[0], "message": settled[1]}
+            continue
+        try:
+            session = await resolve_scan_session(token, scanned_at, queued=True)
+        except ScanError as e:
+            settle(index, key, "rejected", str(e))
+            continue
+        accepted.append((index, key, session, student_number, scanned_at))
+
+    student_ids = await repository.get_student_ids(
+        list({student_number for _, _, _, student_number, _ in accepted})
+    )
+    scans = []
+    for index, key, session, student_number, scanned_at in accepted:
+        student_id = student_ids.get(student_number)
+        if student_id is None:
+            settle(index, key, "rejected", "Unknown student.")
+        else:
+            scans.append((index, key, session, student_id, scanned_at))
+
+    inserted = await record_attendance(
+        [(session.id, student_id, at) for _, _, session, student_id, at in scans]
+    )
+    for index, key, session, student_id, _ in scans:
+        pair = (session.id, student_id)
+        if pair in inserted:
+            inserted.discard(pair)
+            message = f"Attendance marked for {session.course_name}."
+            settle(index, key, "inserted", message)
+        else:
+            message = "Already marked present for this session."
+            settle(index, key, "duplicate", message)
+    return results
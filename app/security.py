@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import rxconfig
+
+
+class HasherBusyError(Exception):
+    """Raised when too many hashing jobs are already waiting for a worker."""
+
+
+class PasswordHasher:
+    """Run bcrypt on a bounded worker pool so logins never block the event loop.
+
+    bcrypt releases the GIL while hashing, so a thread pool gives real
+    parallelism. At most ``max_pending`` jobs may be queued or running;
+    beyond that, callers get ``HasherBusyError`` straight away instead of
+    waiting behind the backlog.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            raise HasherBusyError
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            self._pending -= 1
+
+    def _hash(self, password: str) -> str:
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(self.rounds)
+        ).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a stored hash was made with a different cost factor."""
+        try:
+            return int(hashed.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+hasher = PasswordHasher(
+    rounds=rxconfig.BCRYPT_ROUNDS,
+    workers=rxconfig.HASH_WORKERS,
+    max_pending=rxconfig.HASH_MAX_PENDING,
+)
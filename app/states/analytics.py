@@ -1,7 +1,9 @@
 import reflex as rx
-from sqlmodel import select, func, desc
+import dataclasses
 from datetime import datetime, timedelta, timezone
-from app.models import Session, Attendance, User, ensure_timezone
+from app.models import ensure_timezone
+from app import repository
+from app.cache import analytics_results
 from app.states.auth import AuthState
 import random
 import string
@@ -12,20 +14,81 @@ from reportlab.lib.styles import getSampleStyleSheet
 import openpyxl
 from openpyxl.styles import Font, PatternFill
 
+PARTICIPATION_BANDS = [
+    ("High", "High (>75%)", "#10b981"),
+    ("Medium", "Medium (40-75%)", "#f59e0b"),
+    ("Low", "Low (<40%)", "#ef4444"),
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class AnalyticsStats:
+    """Query results behind the analytics dashboard, shared through the cache."""
+
+    sessions: tuple[tuple[int, str, bool, int], ...]
+    daily: tuple[tuple[str, int], ...]
+    participation: dict[str, int]
+    courses: tuple[tuple[int, str, str], ...]
+
+
+async def query_stats(
+    teacher_id: int, session_id: int | None, created_after: datetime | None
+) -> AnalyticsStats:
+    sessions = await repository.count_session_attendance(
+        teacher_id, session_id, created_after
+    )
+    daily = await repository.count_daily_attendance(
+        teacher_id, session_id, created_after
+    )
+    participation = await repository.count_participation(
+        teacher_id, len(sessions), session_id, created_after
+    )
+    all_sessions = await repository.list_teacher_sessions(teacher_id)
+    return AnalyticsStats(
+        sessions=tuple(tuple(row) for row in sessions),
+        daily=tuple(tuple(row) for row in daily),
+        participation=participation,
+        courses=tuple(
+            (s.id, s.course_name, s.created_at.strftime("%m/%d"))
+            for s in all_sessions[-20:]
+        ),
+    )
+
 
 class AnalyticsState(rx.State):
     """Handle analytics data aggregation and exports."""
 
     total_sessions: int = 0
     total_students: int = 0
-    avg_attendance: float = 0.0
     active_sessions_count: int = 0
     attendance_trends: list[dict] = []
     session_performance: list[dict] = []
-    student_distribution: list[dict] = []
     date_range: str = "all"
     selected_course_id: str = "all"
-    available_courses: list[dict] = []
+    _attendance_count: int = 0
+    _participation: dict[str, int] = {}
+    _courses: list[tuple[int, str, str]] = []
+
+    @rx.var
+    def avg_attendance(self) -> float:
+        if self.total_sessions == 0:
+            return 0.0
+        return round(self._attendance_count / self.total_sessions, 1)
+
+    @rx.var
+    def student_distribution(self) -> list[dict]:
+        return [
+            {"name": name, "value": self._participation[key], "fill": fill}
+            for key, name, fill in PARTICIPATION_BANDS
+            if self._participation.get(key, 0) > 0
+        ]
+
+    @rx.var
+    def available_courses(self) -> list[dict]:
+        return [
+            {"label": f"{course_name} ({created})", "value": str(session_id)}
+            for session_id, course_name, created in self._courses
+        ]
 
     @rx.event
     async def load_stats(self):
@@ -34,104 +97,41 @@ class AnalyticsState(rx.State):
         if not auth_state.is_authenticated or auth_state.user_role != "teacher":
             return
         teacher_id = auth_state.user_id
-        with rx.session() as session:
-            query = select(Session).where(Session.teacher_id == teacher_id)
-            if self.selected_course_id != "all":
-                query = query.where(Session.id == int(self.selected_course_id))
-            now_utc = datetime.now(timezone.utc)
-            if self.date_range == "week":
-                week_ago = now_utc - timedelta(days=7)
-                query = query.where(Session.created_at >= week_ago)
-            elif self.date_range == "month":
-                month_ago = now_utc - timedelta(days=30)
-                query = query.where(Session.created_at >= month_ago)
-            sessions = session.exec(query).all()
-            session_ids = [s.id for s in sessions]
-            self.total_sessions = len(sessions)
-            self.active_sessions_count = sum((1 for s in sessions if s.is_active))
-            if session_ids:
-                att_query = select(Attendance).where(
-                    Attendance.session_id.in_(session_ids)
-                )
-                attendances = session.exec(att_query).all()
-            else:
-                attendances = []
-            unique_student_ids = {a.student_id for a in attendances}
-            self.total_students = len(unique_student_ids)
-            total_attendance_count = len(attendances)
-            if self.total_sessions > 0:
-                self.avg_attendance = round(
-                    total_attendance_count / self.total_sessions, 1
-                )
-            else:
-                self.avg_attendance = 0.0
-            date_groups = {}
-            for att in attendances:
-                date_str = att.scanned_at.strftime("%Y-%m-%d")
-                date_groups[date_str] = date_groups.get(date_str, 0) + 1
-            self.attendance_trends = [
-                {"date": k, "count": v} for k, v in sorted(date_groups.items())
-            ]
-            sess_groups = {}
-            for att in attendances:
-                sess_groups[att.session_id] = sess_groups.get(att.session_id, 0) + 1
-            self.session_performance = []
-            for s in sessions:
-                count = sess_groups.get(s.id, 0)
-                name = s.course_name
-                if len(name) > 15:
-                    name = name[:12] + "..."
-                self.session_performance.append(
-                    {"name": name, "attendees": count, "full_name": s.course_name}
-                )
-            self.session_performance.reverse()
-            student_counts = {}
-            for att in attendances:
-                student_counts[att.student_id] = (
-                    student_counts.get(att.student_id, 0) + 1
-                )
-            participation = {"High": 0, "Medium": 0, "Low": 0}
-            for s_id, count in student_counts.items():
-                ratio = count / self.total_sessions if self.total_sessions > 0 else 0
-                if ratio >= 0.75:
-                    participation["High"] += 1
-                elif ratio >= 0.4:
-                    participation["Medium"] += 1
-                else:
-                    participation["Low"] += 1
-            self.student_distribution = [
-                {
-                    "name": "High (>75%)",
-                    "value": participation["High"],
-                    "fill": "#10b981",
-                },
-                {
-                    "name": "Medium (40-75%)",
-                    "value": participation["Medium"],
-                    "fill": "#f59e0b",
-                },
-                {
-                    "name": "Low (<40%)",
-                    "value": participation["Low"],
-                    "fill": "#ef4444",
-                },
-            ]
-            self.student_distribution = [
-                x for x in self.student_distribution if x["value"] > 0
-            ]
-            all_sessions = session.exec(
-                select(Session).where(Session.teacher_id == teacher_id)
-            ).all()
-            courses = {}
-            for s in all_sessions:
-                courses[s.course_name] = s.id
-            self.available_courses = [
-                {
-                    "label": f"{s.course_name} ({s.created_at.strftime('%m/%d')})",
-                    "value": str(s.id),
-                }
-                for s in all_sessions[-20:]
-            ]
+        session_filter = None
+        if self.selected_course_id != "all":
+            session_filter = int(self.selected_course_id)
+        now_utc = datetime.now(timezone.utc)
+        created_after = None
+        if self.date_range == "week":
+            created_after = now_utc - timedelta(days=7)
+        elif self.date_range == "month":
+            created_after = now_utc - timedelta(days=30)
+        key = analytics_results.key(
+            teacher_id, (self.selected_course_id, self.date_range)
+        )
+        stats = analytics_results.get(key)
+        if stats is None:
+            stats = await query_stats(teacher_id, session_filter, created_after)
+            analytics_results.put(key, stats)
+        self.total_sessions = len(stats.sessions)
+        self.active_sessions_count = sum(active for _, _, active, _ in stats.sessions)
+        self._attendance_count = sum(count for _, _, _, count in stats.sessions)
+        self.attendance_trends = [
+            {"date": day, "count": count} for day, count in stats.daily
+        ]
+        session_performance = []
+        for _, name, _, count in stats.sessions:
+            if len(name) > 15:
+                name = name[:12] + "..."
+            session_performance.append({"name": name, "attendees": count})
+        session_performance.reverse()
+        self.session_performance = session_performance
+        self.total_students = sum(stats.participation.values())
+        self._participation = dict(stats.participation)
+        courses = list(stats.courses)
+        # Reassigning marks the var dirty, so only resend the options on change.
+        if courses != self._courses:
+            self._courses = courses
 
     @rx.event
     def set_date_range(self, val: str):
@@ -148,22 +148,13 @@ class AnalyticsState(rx.State):
         """Generate and download PDF report."""
         auth_state = await self.get_state(AuthState)
         teacher_id = auth_state.user_id
-        with rx.session() as db_session:
-            query = select(Session).where(Session.teacher_id == teacher_id)
-            if self.selected_course_id != "all":
-                query = query.where(Session.id == int(self.selected_course_id))
-            sessions = db_session.exec(query).all()
-            session_ids = [s.id for s in sessions]
-            if not session_ids:
-                attendances = []
-            else:
-                stmt = (
-                    select(Attendance, User)
-                    .where(Attendance.session_id.in_(session_ids))
-                    .where(Attendance.student_id == User.id)
-                )
-                results = db_session.exec(stmt).all()
-                attendances = [(a, u) for a, u in results]
+        session_filter = None
+        if self.selected_course_id != "all":
+            session_filter = int(self.selected_course_id)
+        sessions = await repository.list_teacher_sessions(teacher_id, session_filter)
+        attendances = await repository.list_attendance_with_students(
+            [s.id for s in sessions]
+        )
         upload_dir = rx.get_upload_dir()
         upload_dir.mkdir(parents=True, exist_ok=True)
         filename = f"report_{random.randint(1000, 9999)}.pdf"
@@ -216,21 +207,13 @@ class AnalyticsState(rx.State):
         """Generate and download Excel report."""
         auth_state = await self.get_state(AuthState)
         teacher_id = auth_state.user_id
-        with rx.session() as db_session:
-            query = select(Session).where(Session.teacher_id == teacher_id)
-            if self.selected_course_id != "all":
-                query = query.where(Session.id == int(self.selected_course_id))
-            sessions = db_session.exec(query).all()
-            session_ids = [s.id for s in sessions]
-            if not session_ids:
-                results = []
-            else:
-                stmt = (
-                    select(Attendance, User)
-                    .where(Attendance.session_id.in_(session_ids))
-                    .where(Attendance.student_id == User.id)
-                )
-                results = db_session.exec(stmt).all()
+        session_filter = None
+        if self.selected_course_id != "all":
+            session_filter = int(self.selected_course_id)
+        sessions = await repository.list_teacher_sessions(teacher_id, session_filter)
+        results = await repository.list_attendance_with_students(
+            [s.id for s in sessions]
+        )
         upload_dir = rx.get_upload_dir()
         upload_dir.mkdir(parents=True, exist_ok=True)
         filename = f"export_{random.randint(1000, 9999)}.xlsx"
@@ -268,4 +251,4 @@ class AnalyticsState(rx.State):
                 ]
             )
         wb.save(filepath)
-        return rx.download(url=f"/_upload/{filename}")
\ No newline at end of file
+        return rx.download(url=f"/_upload/{filename}")
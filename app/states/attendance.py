@@ -1,29 +1,63 @@
 import reflex as rx
-import logging
-from sqlmodel import select, desc
-from datetime import datetime, timezone
-from app.models import Session, Attendance, ensure_timezone
+import json
+import rxconfig
+from datetime import datetime, timedelta, timezone
+from app import repository
+from app.cache import replayed_scans
+from app.metrics import decode_metrics
+from app.scans import ScanError, mark_present, resolve_scan_session
 from app.states.auth import AuthState
 
+REPLAY_MAX_BATCH = 50
+HISTORY_PAGE_SIZE = 30
+
 
 class AttendanceState(rx.State):
     """Handle attendance scanning and history."""
 
-    show_scanner: bool = False
     scan_code: str = ""
+    # Offline-queue key of a scanned (not typed) code, acked once it is recorded.
+    _scan_key: str = ""
     history: list[dict] = []
+    has_more_history: bool = False
     total_attended: int = 0
+    _history_before: tuple[datetime, int] | None = None
 
     @rx.event
-    def toggle_scanner(self, open_status: bool):
-        """Toggle the scanner modal visibility."""
-        self.show_scanner = open_status
-        if not open_status:
-            self.scan_code = ""
+    def submit_scan(self, form_data: dict):
+        """Take a code typed into the scanner form, or submitted by the camera."""
+        self.scan_code = form_data.get("scan_code", "").strip()
+        self._scan_key = form_data.get("scan_key", "")
+        return AttendanceState.process_scan
 
     @rx.event
-    def set_scan_code(self, value: str):
-        self.scan_code = value
+    def report_decode_stats(self, stats: dict):
+        """Collect the scanner's per-engine decode timings."""
+        decode_metrics.record(stats)
+
+    async def _record_scan(
+        self, student_id: int, token: str, scanned_at: datetime, queued: bool
+    ) -> tuple[str, str, bool]:
+        """Validate and record one scan taken at ``scanned_at``.
+
+        Returns the toast level, the message, and whether the outcome is final,
+        i.e. a queued scan can be dropped from the device.
+        """
+        try:
+            session_obj = await resolve_scan_session(token, scanned_at, queued)
+        except ScanError as e:
+            return "error", str(e), True
+        try:
+            inserted = await mark_present(session_obj, student_id, scanned_at)
+        except ScanError as e:
+            return "error", str(e), False
+        if not inserted:
+            return (
+                "warning",
+                "You have already marked attendance for this session.",
+                True,
+            )
+        return "success", f"Attendance marked for {session_obj.course_name}!", True
 
     @rx.event
     async def process_scan(self):
@@ -32,69 +66,110 @@ class AttendanceState(rx.State):
         if not auth_state.is_authenticated or auth_state.user_role != "student":
             yield rx.window_alert("You must be logged in as a student.")
             return
-        if not self.scan_code.startswith("ATTENDQR_SESSION_"):
-            yield rx.toast.error("Invalid QR Code format.")
-            return
-        try:
-            session_id = int(self.scan_code.replace("ATTENDQR_SESSION_", ""))
-        except ValueError as e:
-            logging.exception(f"Error: {e}")
-            yield rx.toast.error("Invalid Session ID in QR Code.")
-            return
-        with rx.session() as db_session:
-            session_obj = db_session.get(Session, session_id)
-            if not session_obj:
-                yield rx.toast.error("Session not found.")
-                return
-            if not session_obj.is_active:
-                yield rx.toast.error("This session has ended.")
-                return
-            now = datetime.now(timezone.utc)
-            expires_at = ensure_timezone(session_obj.expires_at)
-            if now > expires_at:
-                yield rx.toast.error("This session has expired.")
-                return
-            existing = db_session.exec(
-                select(Attendance)
-                .where(Attendance.session_id == session_id)
-                .where(Attendance.student_id == auth_state.user_id)
-            ).first()
-            if existing:
-                self.show_scanner = False
-                yield rx.toast.warning(
-                    "You have already marked attendance for this session."
+        level, message, _ = await self._record_scan(
+            auth_state.user_id,
+            self.scan_code,
+            datetime.now(timezone.utc),
+            queued=False,
+        )
+        yield getattr(rx.toast, level)(message)
+        if level != "error":
+            # A rejected scan stays queued: if it arrived late, the replay
+            # places it at its capture time and settles it.
+            if self._scan_key:
+                yield rx.call_script(
+                    f"window.scanQueue.ack({json.dumps([self._scan_key])})"
                 )
-                return
-            attendance = Attendance(
-                session_id=session_id, student_id=auth_state.user_id, status="present"
+            yield rx.call_script("window.qrScanner.close()")
+        if level == "success":
+            yield AttendanceState.load_history
+
+    @rx.event
+    async def replay_scans(self, entries: list):
+        """Record scans taken offline and acknowledge the settled keys.
+
+        Each entry carries an idempotency key and its age on the device clock,
+        so the scan is placed on the server clock and checked against the
+        token's rotation window as of that moment. Online captures are queued
+        too, and only replayed if ``process_scan`` did not record them on
+        arrival. The age is the device's claim, which is why replays are
+        capped at ``OFFLINE_SCAN_MAX_AGE_SECONDS``.
+        """
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_authenticated or auth_state.user_role != "student":
+            return
+        now = datetime.now(timezone.utc)
+        settled = []
+        outcomes = []
+        for entry in entries[:REPLAY_MAX_BATCH]:
+            try:
+                key = str(entry["key"])
+                token = str(entry["token"])
+                age_ms = int(entry["age_ms"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            ledger_key = f"{auth_state.user_id}:{key}"
+            if replayed_scans.get(ledger_key) is not None:
+                settled.append(key)
+                continue
+            # Past the cap the scan is refused anyway; clamping keeps a huge
+            # claimed age from overflowing the timedelta.
+            age_ms = min(
+                max(0, age_ms), (rxconfig.OFFLINE_SCAN_MAX_AGE_SECONDS + 1) * 1000
+            )
+            level, message, final = await self._record_scan(
+                auth_state.user_id,
+                token,
+                now - timedelta(milliseconds=age_ms),
+                queued=True,
             )
-            db_session.add(attendance)
-            db_session.commit()
-            self.show_scanner = False
-            yield rx.toast.success(f"Attendance marked for {session_obj.course_name}!")
+            if final:
+                replayed_scans.put(ledger_key, (level, message))
+                settled.append(key)
+            outcomes.append((level, message))
+        yield rx.call_script(f"window.scanQueue.ack({json.dumps(settled)})")
+        if len(outcomes) == 1:
+            level, message = outcomes[0]
+            yield getattr(rx.toast, level)(message)
+        elif outcomes:
+            marked = sum(level == "success" for level, _ in outcomes)
+            yield rx.toast.info(f"Synced {len(outcomes)} offline scans, {marked} new.")
+        if any(level == "success" for level, _ in outcomes):
             yield AttendanceState.load_history
 
     @rx.event
     async def load_history(self):
-        """Load attendance history for the current student."""
+        """Load the first page of history and the total for the current student."""
         auth_state = await self.get_state(AuthState)
         if not auth_state.is_authenticated:
             return
-        with rx.session() as db_session:
-            results = db_session.exec(
-                select(Attendance, Session)
-                .where(Attendance.session_id == Session.id)
-                .where(Attendance.student_id == auth_state.user_id)
-                .order_by(desc(Attendance.scanned_at))
-            ).all()
-            self.history = []
-            for att, sess in results:
-                self.history.append(
-                    {
-                        "course_name": sess.course_name,
-                        "scanned_at": att.scanned_at.strftime("%Y-%m-%d %H:%M"),
-                        "status": att.status,
-                        "session_id": sess.id,
-                    }
-                )
-            self.total_attended = len(self.history)
\ No newline at end of file
+        self.history = []
+        self._history_before = None
+        self.has_more_history = True
+        self.total_attended = await repository.count_student_history(auth_state.user_id)
+        await self._load_history_page(auth_state.user_id)
+
+    @rx.event
+    async def load_more_history(self):
+        """Append the next page of history, when the list is scrolled to its end."""
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_authenticated or not self.has_more_history:
+            return
+        await self._load_history_page(auth_state.user_id)
+
+    async def _load_history_page(self, student_id: int):
+        rows = await repository.list_student_history(
+            student_id, self._history_before, HISTORY_PAGE_SIZE
+        )
+        self.history = self.history + [
+            {
+                "course_name": course_name,
+                "scanned_at": scanned_at.strftime("%Y-%m-%d %H:%M"),
+                "status": status,
+                "session_id": session_id,
+            }
+            for _, scanned_at, status, session_id, course_name in rows
+        ]
+        if rows:
+            self._history_before = (rows[-1][1], rows[-1][0])
+        self.has_more_history = len(rows) == HISTORY_PAGE_SIZE
@@ -1,7 +1,10 @@
+import logging
 import reflex as rx
-import bcrypt
-from sqlmodel import select
 from app.models import User
+from app import repository
+from app.security import hasher, HasherBusyError
+
+BUSY_MESSAGE = "The server is busy, please try again in a moment."
 
 
 class AuthState(rx.State):
@@ -11,14 +14,6 @@ class AuthState(rx.State):
     user_name: str = ""
     user_role: str = ""
     is_authenticated: bool = False
-    email_input: str = ""
-    student_id_input: str = ""
-    password_input: str = ""
-    reg_full_name: str = ""
-    reg_email: str = ""
-    reg_student_id: str = ""
-    reg_password: str = ""
-    reg_confirm_password: str = ""
 
     @rx.var
     def is_teacher(self) -> bool:
@@ -28,49 +23,58 @@ class AuthState(rx.State):
     def is_student(self) -> bool:
         return self.user_role == "student"
 
-    def _verify_password(self, plain_password, hashed_password):
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-        )
-
-    def _get_hash(self, password):
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    async def _verify_password(
+        self, user: User | None, role: str, password: str
+    ) -> bool:
+        """Check the password, upgrading the stored hash if the cost factor changed.
+
+        The upgrade is best-effort: a busy hasher must not fail a correct login.
+        """
+        if not user or user.role != role:
+            return False
+        if not await hasher.verify(password, user.password_hash):
+            return False
+        if hasher.needs_rehash(user.password_hash):
+            try:
+                password_hash = await hasher.hash(password)
+            except HasherBusyError:
+                logging.warning(
+                    f"Hasher busy, not upgrading the hash of user {user.id}."
+                )
+            else:
+                await repository.update_password_hash(user.id, password_hash)
+        return True
+
+    def _login(self, user: User):
+        self.user_id = user.id
+        self.user_name = user.full_name
+        self.user_role = user.role
+        self.is_authenticated = True
+        return rx.redirect("/dashboard")
 
     @rx.event
-    def login_teacher(self):
-        with rx.session() as session:
-            user = session.exec(
-                select(User).where(User.email == self.email_input)
-            ).first()
-            if (
-                user
-                and user.role == "teacher"
-                and self._verify_password(self.password_input, user.password_hash)
+    async def login_teacher(self, form_data: dict):
+        user = await repository.get_user_by_email(form_data.get("email", ""))
+        try:
+            if await self._verify_password(
+                user, "teacher", form_data.get("password", "")
             ):
-                self.user_id = user.id
-                self.user_name = user.full_name
-                self.user_role = user.role
-                self.is_authenticated = True
-                return rx.redirect("/dashboard")
-            return rx.window_alert("Invalid email or password")
+                return self._login(user)
+        except HasherBusyError:
+            return rx.window_alert(BUSY_MESSAGE)
+        return rx.window_alert("Invalid email or password")
 
     @rx.event
-    def login_student(self):
-        with rx.session() as session:
-            user = session.exec(
-                select(User).where(User.student_id == self.student_id_input)
-            ).first()
-            if (
-                user
-                and user.role == "student"
-                and self._verify_password(self.password_input, user.password_hash)
+    async def login_student(self, form_data: dict):
+        user = await repository.get_user_by_student_id(form_data.get("student_id", ""))
+        try:
+            if await self._verify_password(
+                user, "student", form_data.get("password", "")
             ):
-                self.user_id = user.id
-                self.user_name = user.full_name
-                self.user_role = user.role
-                self.is_authenticated = True
-                return rx.redirect("/dashboard")
-            return rx.window_alert("Invalid student ID or password")
+                return self._login(user)
+        except HasherBusyError:
+            return rx.window_alert(BUSY_MESSAGE)
+        return rx.window_alert("Invalid student ID or password")
 
     @rx.event
     def logout(self):
@@ -78,7 +82,8 @@ class AuthState(rx.State):
         self.user_name = ""
         self.user_role = ""
         self.is_authenticated = False
-        return rx.redirect("/")
+        # Queued offline scans belong to the student who took them.
+        return [rx.call_script("window.scanQueue.clear()"), rx.redirect("/")]
 
     @rx.event
     def check_login(self):
@@ -86,93 +91,79 @@ class AuthState(rx.State):
             return rx.redirect("/")
 
     @rx.event
-    def seed_test_users(self):
+    async def seed_test_users(self):
         """Create test users if none exist."""
-        with rx.session() as session:
-            if session.exec(select(User)).first():
-                return
-            teacher = User(
-                full_name="Prof. Smith",
-                password_hash=self._get_hash("teacher123"),
-                role="teacher",
-                email="teacher@school.com",
-            )
-            session.add(teacher)
-            student = User(
-                full_name="John Doe",
-                password_hash=self._get_hash("student123"),
-                role="student",
-                student_id="S12345",
-            )
-            session.add(student)
-            session.commit()
-
-    @rx.event
-    def set_reg_full_name(self, value: str):
-        self.reg_full_name = value
-
-    @rx.event
-    def set_reg_email(self, value: str):
-        self.reg_email = value
-
-    @rx.event
-    def set_reg_student_id(self, value: str):
-        self.reg_student_id = value
-
-    @rx.event
-    def set_reg_password(self, value: str):
-        self.reg_password = value
-
-    @rx.event
-    def set_reg_confirm_password(self, value: str):
-        self.reg_confirm_password = value
+        if await repository.has_users():
+            return
+        try:
+            teacher_hash = await hasher.hash("teacher123")
+            student_hash = await hasher.hash("student123")
+        except HasherBusyError:
+            return rx.window_alert(BUSY_MESSAGE)
+        teacher = User(
+            full_name="Prof. Smith",
+            password_hash=teacher_hash,
+            role="teacher",
+            email="teacher@school.com",
+        )
+        student = User(
+            full_name="John Doe",
+            password_hash=student_hash,
+            role="student",
+            student_id="S12345",
+        )
+        await repository.add_users(teacher, student)
 
     @rx.event
-    def register_teacher(self):
-        if not self.reg_full_name or not self.reg_email or (not self.reg_password):
+    async def register_teacher(self, form_data: dict):
+        full_name = form_data.get("full_name", "").strip()
+        email = form_data.get("email", "").strip()
+        password = form_data.get("password", "")
+        if not full_name or not email or (not password):
             return rx.window_alert("Please fill in all fields")
-        if self.reg_password != self.reg_confirm_password:
+        if password != form_data.get("confirm_password", ""):
             return rx.window_alert("Passwords do not match")
-        with rx.session() as session:
-            existing = session.exec(
-                select(User).where(User.email == self.reg_email)
-            ).first()
-            if existing:
-                return rx.window_alert("Email already registered")
-            teacher = User(
-                full_name=self.reg_full_name,
-                email=self.reg_email,
-                password_hash=self._get_hash(self.reg_password),
-                role="teacher",
-            )
-            session.add(teacher)
-            session.commit()
+        if await repository.get_user_by_email(email):
+            return rx.window_alert("Email already registered")
+        try:
+            password_hash = await hasher.hash(password)
+        except HasherBusyError:
+            return rx.window_alert(BUSY_MESSAGE)
+        teacher = User(
+            full_name=full_name,
+            email=email,
+            password_hash=password_hash,
+            role="teacher",
+        )
+        await repository.add_users(teacher)
         return [
             rx.window_alert("Registration successful! Please login."),
             rx.redirect("/login/teacher"),
         ]
 
     @rx.event
-    def register_student(self):
-        if not self.reg_full_name or not self.reg_student_id or (not self.reg_password):
+    async def register_student(self, form_data: dict):
+        full_name = form_data.get("full_name", "").strip()
+        student_id = form_data.get("student_id", "").strip()
+        password = form_data.get("password", "")
+        if not full_name or not student_id or (not password):
             return rx.window_alert("Please fill in all fields")
-        if self.reg_password != self.reg_confirm_password:
+        if password != form_data.get("confirm_password", ""):
             return rx.window_alert("Passwords do not match")
-        with rx.session() as session:
-            existing = session.exec(
-                select(User).where(User.student_id == self.reg_student_id)
-            ).first()
-            if existing:
-                return rx.window_alert("Student ID already registered")
-            student = User(
-                full_name=self.reg_full_name,
-                student_id=self.reg_student_id,
-                password_hash=self._get_hash(self.reg_password),
-                role="student",
-            )
-            session.add(student)
-            session.commit()
+        if await repository.get_user_by_student_id(student_id):
+            return rx.window_alert("Student ID already registered")
+        try:
+            password_hash = await hasher.hash(password)
+        except HasherBusyError:
+            return rx.window_alert(BUSY_MESSAGE)
+        student = User(
+            full_name=full_name,
+            student_id=student_id,
+            password_hash=password_hash,
+            role="student",
+        )
+        await repository.add_users(student)
         return [
             rx.window_alert("Registration successful! Please login."),
             rx.redirect("/login/student"),
-        ]
\ No newline at end of file
+        ]
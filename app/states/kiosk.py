@@ -0,0 +1,149 @@
+import reflex as rx
+import asyncio
+import json
+import logging
+import multiprocessing
+from datetime import datetime, timezone
+import rxconfig
+from app import repository
+from app.badges import generate_badge_pdf, new_sheet_path, sheet_url
+from app.cache import CachedSession, active_sessions
+from app.scans import ScanError, mark_present
+from app.tokens import TokenError, require_stable_secret, verify_badge_token
+from app.states.auth import AuthState
+
+RECENT_LIMIT = 20
+
+
+class KioskState(rx.State):
+    """Teacher-side kiosk that records attendance from student badge QRs."""
+
+    session_id: int = -1
+    session_title: str = ""
+    marked_count: int = 0
+    recent: list[dict] = []
+    badges_running: bool = False
+    badges_progress: int = 0
+
+    @rx.event
+    async def select_session(self, value: str):
+        auth_state = await self.get_state(AuthState)
+        session = await active_sessions.get(int(value)) if value.isdigit() else None
+        if (
+            not session
+            or not session.is_active
+            or session.teacher_id != auth_state.user_id
+        ):
+            self.session_id = -1
+            self.session_title = ""
+            return
+        self.session_id = session.id
+        self.session_title = session.course_name
+        self.marked_count = 0
+        self.recent = []
+
+    async def _mark(
+        self, session: CachedSession, student_id: int, scanned_at: datetime
+    ) -> str:
+        try:
+            inserted = await mark_present(session, student_id, scanned_at)
+        except ScanError:
+            return "error"
+        return "marked" if inserted else "already"
+
+    @rx.event
+    async def record_badges(self, form_data: dict):
+        """Record a burst of badge reads from the kiosk scanner.
+
+        Reads are verified locally and submitted to the ingestor together, so
+        they share its batched commits with every other scan in flight.
+        """
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_authenticated or auth_state.user_role != "teacher":
+            return rx.window_alert("You must be logged in as a teacher.")
+        session = await active_sessions.get(self.session_id)
+        if not session or not session.is_active:
+            self.session_id = -1
+            return rx.toast.error("Select an active session first.")
+        try:
+            badges = json.loads(form_data.get("badges", "[]"))[
+                : rxconfig.KIOSK_MAX_BATCH
+            ]
+        except (TypeError, ValueError):
+            return
+        scanned_at = datetime.now(timezone.utc)
+        entries = []
+        student_ids = []
+        for badge in badges:
+            try:
+                student_id = verify_badge_token(str(badge))
+            except TokenError as e:
+                entries.append({"name": "Unknown badge", "status": str(e)})
+                continue
+            student_ids.append(student_id)
+        names = await repository.get_student_names(student_ids)
+        known = [student_id for student_id in student_ids if student_id in names]
+        outcomes = await asyncio.gather(
+            *(self._mark(session, student_id, scanned_at) for student_id in known)
+        )
+        for student_id, outcome in zip(known, outcomes):
+            status = {
+                "marked": "Marked present",
+                "already": "Already marked",
+                "error": "Could not record, scan again",
+            }[outcome]
+            entries.append({"name": names[student_id], "status": status})
+            self.marked_count += outcome == "marked"
+        for student_id in student_ids:
+            if student_id not in names:
+                entries.append({"name": "Unknown student", "status": "Not registered"})
+        stamp = scanned_at.strftime("%H:%M:%S")
+        for entry in entries:
+            entry["time"] = stamp
+        self.recent = (entries[::-1] + self.recent)[:RECENT_LIMIT]
+
+    @rx.event(background=True)
+    async def generate_badges(self):
+        """Build a printable badge sheet for every student and download it."""
+        try:
+            require_stable_secret()
+        except TokenError as e:
+            yield rx.toast.error(str(e))
+            return
+        async with self:
+            auth_state = await self.get_state(AuthState)
+            if auth_state.user_role != "teacher" or self.badges_running:
+                return
+            self.badges_running = True
+            self.badges_progress = 0
+        progress = {"done": 0, "total": 1}
+        try:
+            students = await repository.list_students()
+            path = new_sheet_path()
+            task = asyncio.create_task(
+                asyncio.to_thread(
+                    generate_badge_pdf,
+                    students,
+                    path,
+                    rxconfig.BADGE_WORKERS,
+                    lambda done, total: progress.update(done=done, total=total),
+                    multiprocessing.get_context("spawn"),
+                )
+            )
+            while not task.done():
+                await asyncio.wait({task}, timeout=0.5)
+                async with self:
+                    self.badges_progress = (
+                        progress["done"] * 100 // max(progress["total"], 1)
+                    )
+            task.result()
+        except Exception as e:
+            logging.exception(f"Error generating badges: {e}")
+            async with self:
+                self.badges_running = False
+            yield rx.toast.error("Could not generate badges.")
+            return
+        async with self:
+            self.badges_running = False
+            self.badges_progress = 100
+        yield rx.download(url=sheet_url(path), filename="student-badges.pdf")
@@ -1,132 +1,199 @@
 import reflex as rx
-import qrcode
-import io
-import base64
+import asyncio
+import dataclasses
 from datetime import datetime, timedelta, timezone
-from sqlmodel import select, func, desc
-from app.models import Session, Attendance, ensure_timezone
+from app.models import Session, ensure_timezone
+import rxconfig
+from app import live, repository
+from app.cache import active_sessions, analytics_results, seen_scans
+from app.qr import qr_images
+from app.tokens import issue_session_token, seconds_until_rotation
 from app.states.auth import AuthState
 
 
+@dataclasses.dataclass
+class SessionSummary:
+    """The fields of an active session that the dashboard renders."""
+
+    id: int
+    course_name: str
+    created_at: str
+    expires_at: str
+
+    @classmethod
+    def from_session(cls, session: Session) -> "SessionSummary":
+        return cls(
+            id=session.id,
+            course_name=session.course_name,
+            created_at=ensure_timezone(session.created_at).isoformat(),
+            expires_at=ensure_timezone(session.expires_at).isoformat(),
+        )
+
+
 class SessionState(rx.State):
     """Handle class sessions and QR code generation."""
 
-    course_name: str = ""
-    duration: int = 60
-    active_sessions: list[Session] = []
+    active_sessions: list[SessionSummary] = []
     attendee_counts: dict[int, int] = {}
     show_qr: bool = False
     qr_code_image: str = ""
     current_session_title: str = ""
     current_session_expiry: str = ""
+    _count_watch: int = 0
+    _watching_counts: bool = False
+    _qr_session_id: int = -1
+    _qr_expires_at: datetime | None = None
+    _qr_rotation: int = 0
 
     @rx.event
     async def load_active_sessions(self):
-        """Load all active sessions for the current teacher, expiring old ones first."""
+        """Load all active sessions for the current teacher."""
         auth_state = await self.get_state(AuthState)
         if not auth_state.is_authenticated or auth_state.user_role != "teacher":
             return
-        with rx.session() as session:
-            now = datetime.now(timezone.utc)
-            active_stm = (
-                select(Session)
-                .where(Session.teacher_id == auth_state.user_id)
-                .where(Session.is_active == True)
-            )
-            candidates = session.exec(active_stm).all()
-            expired_found = False
-            for s in candidates:
-                expires_at = ensure_timezone(s.expires_at)
-                if now > expires_at:
-                    s.is_active = False
-                    session.add(s)
-                    expired_found = True
-            if expired_found:
-                session.commit()
-            statement = (
-                select(Session)
-                .where(Session.teacher_id == auth_state.user_id)
-                .where(Session.is_active == True)
-                .order_by(desc(Session.created_at))
-            )
-            sessions = session.exec(statement).all()
-            for s in sessions:
-                s.created_at = ensure_timezone(s.created_at)
-                s.expires_at = ensure_timezone(s.expires_at)
-            self.active_sessions = sessions
-            self.attendee_counts = {}
-            for s in self.active_sessions:
-                count_stmt = select(func.count()).where(Attendance.session_id == s.id)
-                count = session.exec(count_stmt).one()
-                self.attendee_counts[s.id] = count
+        sessions = await repository.list_active_sessions(
+            auth_state.user_id, datetime.now(timezone.utc)
+        )
+        self.active_sessions = [SessionSummary.from_session(s) for s in sessions]
+        self.attendee_counts = {s.id: s.attendee_count for s in sessions}
+
+    @rx.event(background=True)
+    async def watch_attendee_counts(self):
+        """Push attendee count changes for the active sessions while the dashboard is open.
+
+        Each start takes a new generation, so a restarted watcher replaces the
+        previous one. The loop also stops once the tab has disconnected or no
+        active session is left to watch.
+        """
+        async with self:
+            auth_state = await self.get_state(AuthState)
+            if auth_state.user_role != "teacher" or not self.attendee_counts:
+                return
+            self._count_watch += 1
+            generation = self._count_watch
+            self._watching_counts = True
+            token = self.router.session.client_token
+            subscription = live.attendee_counts.subscribe(set(self.attendee_counts))
+        try:
+            while True:
+                changed = await subscription.next(timeout=5)
+                async with self:
+                    if (
+                        self._count_watch != generation
+                        or not self.attendee_counts
+                        or not live.client_connected(token)
+                    ):
+                        return
+                    subscription.session_ids = set(self.attendee_counts)
+                    if changed:
+                        self.attendee_counts = {**self.attendee_counts, **changed}
+                if changed:
+                    await asyncio.sleep(rxconfig.LIVE_COUNT_INTERVAL_SECONDS)
+        finally:
+            live.attendee_counts.unsubscribe(subscription)
+            async with self:
+                if self._count_watch == generation:
+                    self._watching_counts = False
 
     @rx.event
-    async def create_session(self):
+    def stop_watching_attendee_counts(self):
+        self._count_watch += 1
+        self._watching_counts = False
+
+    @rx.event
+    async def create_session(self, form_data: dict):
         """Create a new class session."""
         auth_state = await self.get_state(AuthState)
-        if not self.course_name:
+        course_name = form_data.get("course_name", "").strip()
+        if not course_name:
             return rx.window_alert("Please enter a course name")
-        with rx.session() as session:
-            now = datetime.now(timezone.utc)
-            expires = now + timedelta(minutes=self.duration)
-            new_session = Session(
+        duration = form_data.get("duration", "")
+        duration = int(duration) if duration.isdigit() else 60
+        now = datetime.now(timezone.utc)
+        expires = now + timedelta(minutes=duration)
+        new_session = await repository.create_class_session(
+            Session(
                 teacher_id=auth_state.user_id,
-                course_name=self.course_name,
+                course_name=course_name,
                 expires_at=expires,
                 is_active=True,
             )
-            session.add(new_session)
-            session.commit()
-            session.refresh(new_session)
-            new_session.created_at = ensure_timezone(new_session.created_at)
-            new_session.expires_at = ensure_timezone(new_session.expires_at)
-        self.course_name = ""
-        self.show_qr_code(
-            new_session.id, new_session.course_name, new_session.expires_at.isoformat()
         )
-        return SessionState.load_active_sessions
+        new_session.created_at = ensure_timezone(new_session.created_at)
+        new_session.expires_at = ensure_timezone(new_session.expires_at)
+        active_sessions.put(new_session)
+        analytics_results.bump(new_session.teacher_id)
+        self._open_qr(new_session.id, new_session.course_name, new_session.expires_at)
+        events = [SessionState.load_active_sessions, SessionState.rotate_qr_code]
+        if not self._watching_counts:
+            # The watcher stops when no session is left; start it again.
+            events.append(SessionState.watch_attendee_counts)
+        return events
 
     @rx.event
     async def end_session(self, session_id: int):
         """End a session manually."""
-        with rx.session() as session:
-            s = session.get(Session, session_id)
-            if s:
-                s.is_active = False
-                session.add(s)
-                session.commit()
+        teacher_id = await repository.end_class_session(session_id)
+        active_sessions.invalidate(session_id)
+        seen_scans.drop(session_id)
+        if teacher_id is not None:
+            analytics_results.bump(teacher_id)
         return SessionState.load_active_sessions
 
-    @rx.event
-    def show_qr_code(self, session_id: int, course_name: str, expires_at: str):
-        """Generate and show QR code for a session."""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(f"ATTENDQR_SESSION_{session_id}")
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        self.qr_code_image = f"data:image/png;base64,{img_str}"
+    def _refresh_qr_image(self):
+        token = issue_session_token(self._qr_session_id, self._qr_expires_at)
+        # Persisted like any other image: with several backend workers,
+        # GET /qr may be served by one that did not render it.
+        self.qr_code_image = qr_images.url_for(token)
+
+    def _open_qr(self, session_id: int, course_name: str, expires_at: datetime):
+        self._qr_session_id = session_id
+        self._qr_expires_at = expires_at
+        self._refresh_qr_image()
         self.current_session_title = course_name
-        self.current_session_expiry = expires_at
+        self.current_session_expiry = expires_at.isoformat()
         self.show_qr = True
 
     @rx.event
-    def close_qr_modal(self):
-        """Close the QR code modal."""
-        self.show_qr = False
+    def show_qr_code(self, session_id: int):
+        """Generate and show QR code for a session."""
+        for s in self.active_sessions:
+            if s.id == session_id:
+                self._open_qr(s.id, s.course_name, datetime.fromisoformat(s.expires_at))
+                return SessionState.rotate_qr_code
 
-    @rx.event
-    def set_course_name(self, value: str):
-        self.course_name = value
+    @rx.event(background=True)
+    async def rotate_qr_code(self):
+        """Re-sign the displayed QR code at every rotation window while it is open.
+
+        Stops when the modal closes or is reopened, the tab disconnects, or
+        the session expires or is ended; a dead session also closes the modal.
+        """
+        async with self:
+            self._qr_rotation += 1
+            generation = self._qr_rotation
+            session_id = self._qr_session_id
+            token = self.router.session.client_token
+        while True:
+            await asyncio.sleep(seconds_until_rotation())
+            session = await active_sessions.get(session_id)
+            async with self:
+                if (
+                    self._qr_rotation != generation
+                    or not self.show_qr
+                    or not live.client_connected(token)
+                ):
+                    return
+                if (
+                    session is None
+                    or not session.is_active
+                    or datetime.now(timezone.utc) >= self._qr_expires_at
+                ):
+                    self.show_qr = False
+                    return
+                self._refresh_qr_image()
 
     @rx.event
-    def set_duration(self, value: str):
-        if value.isdigit():
-            self.duration = int(value)
\ No newline at end of file
+    def close_qr_modal(self):
+        """Close the QR code modal."""
+        self.show_qr = False
@@ -0,0 +1,22 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+import rxconfig
+from app import repository
+from app.cache import active_sessions, analytics_results, seen_scans
+
+
+async def expire_sessions_periodically():
+    """Deactivate expired sessions in one indexed UPDATE every sweep interval."""
+    while True:
+        try:
+            expired = await repository.expire_sessions(datetime.now(timezone.utc))
+            for session_id, teacher_id in expired:
+                active_sessions.invalidate(session_id)
+                seen_scans.drop(session_id)
+                analytics_results.bump(teacher_id)
+            if expired:
+                logging.info(f"Expired {len(expired)} sessions.")
+        except Exception as e:
+            logging.exception(f"Error expiring sessions: {e}")
+        await asyncio.sleep(rxconfig.SESSION_SWEEP_INTERVAL_SECONDS)
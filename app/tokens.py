@@ -0,0 +1,114 @@
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import datetime, timezone
+import rxconfig
+
+TOKEN_PREFIX = "AQR1"
+BADGE_PREFIX = "AQRB1"
+
+
+class TokenError(Exception):
+    """A scanned QR token is forged, malformed or no longer valid."""
+
+
+def _load_secret() -> bytes:
+    if rxconfig.QR_TOKEN_SECRET:
+        return rxconfig.QR_TOKEN_SECRET.encode("utf-8")
+    logging.warning(
+        "QR_TOKEN_SECRET is not set; using a per-process secret. QR codes will "
+        "stop working after a restart and across backend workers."
+    )
+    return secrets.token_bytes(32)
+
+
+_SECRET = _load_secret()
+# Set when _load_secret fell back to a key that dies with this process.
+_EPHEMERAL_SECRET = not rxconfig.QR_TOKEN_SECRET
+
+
+def require_stable_secret():
+    """Raise TokenError unless tokens are signed with the configured secret.
+
+    Badges are printed once and used all term, so signing them with the
+    per-process fallback would leave them unverifiable by any other process.
+    """
+    if _EPHEMERAL_SECRET:
+        raise TokenError(
+            "Set ATTENDQR_TOKEN_SECRET before printing badges; without it they "
+            "stop working after a restart and on other backend workers."
+        )
+
+
+def _sign(message: str) -> str:
+    digest = hmac.new(_SECRET, message.encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode("ascii")
+
+
+def _signature_matches(body: str, signature: str) -> bool:
+    # Compare bytes: compare_digest raises TypeError for non-ASCII str, and
+    # "replace" keeps lone surrogates from a JSON payload from raising too.
+    return hmac.compare_digest(
+        signature.encode("utf-8", "replace"), _sign(body).encode("ascii")
+    )
+
+
+def _window(at: datetime) -> int:
+    return int(at.timestamp()) // rxconfig.QR_TOKEN_ROTATION_SECONDS
+
+
+def seconds_until_rotation(now: datetime | None = None) -> float:
+    now = now or datetime.now(timezone.utc)
+    period = rxconfig.QR_TOKEN_ROTATION_SECONDS
+    return period - now.timestamp() % period
+
+
+def issue_session_token(
+    session_id: int, expires_at: datetime, now: datetime | None = None
+) -> str:
+    """Sign a QR payload for the session, valid for the current rotation window."""
+    now = now or datetime.now(timezone.utc)
+    body = f"{TOKEN_PREFIX}.{session_id}.{_window(now)}.{int(expires_at.timestamp())}"
+    return f"{body}.{_sign(body)}"
+
+
+def verify_session_token(token: str, now: datetime | None = None) -> int:
+    """Check a scanned token without touching the database.
+
+    Returns the session id, or raises TokenError if the signature does not
+    match, the rotation window has passed, or the session has expired.
+    """
+    now = now or datetime.now(timezone.utc)
+    body, _, signature = token.strip().rpartition(".")
+    parts = body.split(".")
+    if len(parts) != 4 or parts[0] != TOKEN_PREFIX:
+        raise TokenError("Invalid QR Code format.")
+    if not _signature_matches(body, signature):
+        raise TokenError("Invalid QR Code.")
+    session_id, window, expires = (int(p) for p in parts[1:])
+    current = _window(now)
+    if not current - rxconfig.QR_TOKEN_GRACE_WINDOWS <= window <= current:
+        raise TokenError("This QR code has rotated. Please scan the current code.")
+    if now.timestamp() > expires:
+        raise TokenError("This session has expired.")
+    return session_id
+
+
+def issue_badge_token(student_id: int) -> str:
+    """Sign a long-lived badge payload identifying a student."""
+    require_stable_secret()
+    body = f"{BADGE_PREFIX}.{student_id}"
+    return f"{body}.{_sign(body)}"
+
+
+def verify_badge_token(token: str) -> int:
+    """Return the student's user id, or raise TokenError for a bad badge."""
+    body, _, signature = token.strip().rpartition(".")
+    prefix, _, student_id = body.partition(".")
+    if prefix != BADGE_PREFIX or not student_id.isdecimal():
+        raise TokenError("Not a student badge.")
+    if not _signature_matches(body, signature):
+        raise TokenError("Invalid badge.")
+    return int(student_id)
@@ -0,0 +1,10 @@
+// Decodes frames for window.qrScanner (app/components/scanner_modal.py) off the main thread.
+importScripts("https://cdn.jsdelivr.net/npm/jsqr@1.4.0/dist/jsQR.js");
+
+self.onmessage = (event) => {
+    const { width, height, buffer } = event.data;
+    const code = jsQR(new Uint8ClampedArray(buffer), width, height, {
+        inversionAttempts: "dontInvert",
+    });
+    self.postMessage(code ? { data: code.data, location: code.location } : null);
+};
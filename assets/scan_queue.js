@@ -0,0 +1,101 @@
+// Offline scan queue and service worker registration for the student scanner.
+//
+// Every decoded QR payload is stored here before it is sent, so scans taken
+// while the classroom network is down, or stuck behind a saturated one that
+// the browser still reports as online, survive reloads. An online scan is also
+// submitted live and dropped from the queue once process_scan acknowledges it.
+// Whatever remains is replayed through the hidden #scan-replay button on the
+// student dashboard, whose handler acknowledges each idempotency key once the
+// server has settled it.
+(function () {
+    const STORAGE_KEY = "attendqr.scanQueue";
+    const MAX_BATCH = 50;
+    const RETRY_MS = 30000;
+
+    function load() {
+        try {
+            return JSON.parse(localStorage.getItem(STORAGE_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function save(entries) {
+        localStorage.setItem(STORAGE_KEY, JSON.stringify(entries));
+    }
+
+    function newKey() {
+        if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return Date.now().toString(36) + Math.random().toString(36).slice(2);
+    }
+
+    window.scanQueue = {
+        lastFlushAt: 0,
+
+        // Returns the entry's idempotency key. A live submission passes
+        // deferred so the replay only starts if no ack came within RETRY_MS.
+        add: function (token, deferred) {
+            const entries = load();
+            // Re-scanning the same code must not queue it twice.
+            let entry = entries.find(e => e.token === token);
+            if (!entry) {
+                entry = { key: newKey(), token: token, captured_at: Date.now() };
+                entries.push(entry);
+                save(entries);
+            }
+            if (deferred) {
+                this.lastFlushAt = Date.now();
+            } else {
+                this.flush(true);
+            }
+            return entry.key;
+        },
+
+        size: function () {
+            return load().length;
+        },
+
+        // Ages are taken when the replay is sent, so the server can place each
+        // scan on its own clock regardless of how far the device clock is off.
+        pending: function () {
+            const now = Date.now();
+            return load().slice(0, MAX_BATCH).map(e => ({
+                key: e.key,
+                token: e.token,
+                age_ms: now - e.captured_at,
+            }));
+        },
+
+        ack: function (keys) {
+            const done = new Set(keys);
+            const rest = load().filter(e => !done.has(e.key));
+            save(rest);
+            this.lastFlushAt = 0;
+            if (done.size && rest.length) this.flush();
+        },
+
+        clear: function () {
+            localStorage.removeItem(STORAGE_KEY);
+        },
+
+        flush: function (force) {
+            const button = document.getElementById("scan-replay");
+            if (!button || !navigator.onLine || !load().length) return;
+            // One replay at a time; a lost ack is retried after RETRY_MS.
+            if (!force && Date.now() - this.lastFlushAt < RETRY_MS) return;
+            this.lastFlushAt = Date.now();
+            button.click();
+        },
+    };
+
+    window.addEventListener("online", () => window.scanQueue.flush(true));
+    setInterval(() => window.scanQueue.flush(), RETRY_MS);
+
+    if ("serviceWorker" in navigator && window.isSecureContext) {
+        window.addEventListener("load", () => {
+            navigator.serviceWorker.register("/sw.js").catch(err => {
+                console.error("Service worker registration failed:", err);
+            });
+        });
+    }
+})();
@@ -0,0 +1,80 @@
+// Service worker: keeps the scanner usable on a collapsing classroom network.
+//
+// Scanner assets are precached, CDN scripts and fonts are cached on first
+// use, other static files are served stale-while-revalidate, and page loads
+// fall back to the last cached copy when the network is unreachable.
+const CACHE = "attendqr-v1";
+const PRECACHE = ["/qr_worker.js", "/scan_queue.js", "/favicon.ico", "/manifest.webmanifest"];
+const CDN_HOSTS = ["cdn.jsdelivr.net", "fonts.googleapis.com", "fonts.gstatic.com"];
+const STATIC_DESTINATIONS = ["script", "style", "font", "image", "worker", "manifest"];
+
+self.addEventListener("install", (event) => {
+    event.waitUntil(caches.open(CACHE).then((cache) => cache.addAll(PRECACHE)));
+    self.skipWaiting();
+});
+
+self.addEventListener("activate", (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((keys) => Promise.all(keys.filter((k) => k !== CACHE).map((k) => caches.delete(k))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function cacheable(response) {
+    // Script tags without crossorigin produce opaque responses; keep those too.
+    return response && (response.ok || response.type === "opaque");
+}
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (cacheable(response)) {
+        const cache = await caches.open(CACHE);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(request) {
+    const cache = await caches.open(CACHE);
+    const cached = await cache.match(request);
+    const network = fetch(request).then((response) => {
+        if (cacheable(response)) cache.put(request, response.clone());
+        return response;
+    });
+    if (cached) {
+        network.catch(() => {});
+        return cached;
+    }
+    return network;
+}
+
+async function networkFirst(request) {
+    const cache = await caches.open(CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) cache.put(request, response.clone());
+        return response;
+    } catch (err) {
+        const cached = await cache.match(request);
+        if (cached) return cached;
+        throw err;
+    }
+}
+
+self.addEventListener("fetch", (event) => {
+    const request = event.request;
+    if (request.method !== "GET") return;
+    const url = new URL(request.url);
+    if (CDN_HOSTS.includes(url.hostname)) {
+        event.respondWith(cacheFirst(request));
+    } else if (url.origin !== self.location.origin) {
+        return;
+    } else if (request.mode === "navigate") {
+        event.respondWith(networkFirst(request));
+    } else if (STATIC_DESTINATIONS.includes(request.destination)) {
+        event.respondWith(staleWhileRevalidate(request));
+    }
+});
@@ -0,0 +1,159 @@
+"""Latency of the analytics dashboard load as the teacher's data grows.
+
+Run from the repository root:
+
+    python -m benchmarks.analytics_stats [--sizes 50x100,200x300,400x500] [--runs 5]
+
+Each size is SESSIONSxSTUDENTS for its own teacher, with 70% of the students
+attending each session. ``sql`` is ``AnalyticsState.load_stats`` on a fresh
+state tree reading the rollup tables, with the result cache invalidated
+before each run; ``cached`` is the same load answered from the cache; ``rows``
+loads every attendance row and counts in Python, as the dashboard used to.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+async def _seed(teacher_email: str, sessions: int, student_ids: list[int]) -> int:
+    from app import repository
+    from app.ingest import record_attendance
+    from app.models import Session, User
+
+    await repository.add_users(
+        User(
+            full_name="Teacher", password_hash="-", role="teacher", email=teacher_email
+        )
+    )
+    teacher = await repository.get_user_by_email(teacher_email)
+    now = datetime.now(timezone.utc)
+    rng = random.Random(0)
+    for n in range(sessions):
+        session = await repository.create_class_session(
+            Session(
+                teacher_id=teacher.id,
+                course_name=f"CS{100 + n % 40} - Introduction to Computing",
+                created_at=now - timedelta(hours=sessions - n),
+                expires_at=now,
+                is_active=False,
+            )
+        )
+        await record_attendance(
+            [
+                (session.id, student_id, session.created_at)
+                for student_id in student_ids
+                if rng.random() < 0.7
+            ]
+        )
+    return teacher.id
+
+
+async def _rows(teacher_id: int):
+    from sqlmodel import select
+    from app import repository
+    from app.database import get_async_session
+    from app.models import Attendance
+
+    sessions = await repository.list_teacher_sessions(teacher_id)
+    async with get_async_session() as db:
+        attendances = (
+            await db.exec(
+                select(Attendance).where(
+                    Attendance.session_id.in_([s.id for s in sessions])
+                )
+            )
+        ).all()
+    Counter(att.scanned_at.strftime("%Y-%m-%d") for att in attendances)
+    Counter(att.session_id for att in attendances)
+    Counter(att.student_id for att in attendances)
+
+
+async def _sql(teacher_id: int):
+    from reflex.state import State
+    from app.states.analytics import AnalyticsState
+    from app.states.auth import AuthState
+
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth.user_id = teacher_id
+    auth.user_role = "teacher"
+    auth.is_authenticated = True
+    await root.get_substate(AnalyticsState.get_full_name().split(".")[1:]).load_stats()
+
+
+async def _cold(teacher_id: int):
+    from app.cache import analytics_results
+
+    analytics_results.bump(teacher_id)
+    await _sql(teacher_id)
+
+
+async def _time(fn, teacher_id: int, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn(teacher_id)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def _main(sizes: list[tuple[int, int]], runs: int):
+    from app import repository
+    from app.database import initialize_db
+    from app.models import User
+
+    initialize_db()
+    most = max(students for _, students in sizes)
+    await repository.add_users(
+        *(
+            User(
+                full_name=f"S{n}", password_hash="-", role="student", student_id=f"S{n}"
+            )
+            for n in range(most)
+        )
+    )
+    student_ids = sorted(
+        (await repository.get_student_ids([f"S{n}" for n in range(most)])).values()
+    )
+    print(f"{'size':>9} {'rows':>8} {'sql ms':>8} {'cached ms':>9} {'rows ms':>8}")
+    for sessions, students in sizes:
+        teacher_id = await _seed(
+            f"t{sessions}x{students}@x", sessions, student_ids[:students]
+        )
+        attendance = sum(
+            count for *_, count in await repository.count_session_attendance(teacher_id)
+        )
+        sql = await _time(_cold, teacher_id, runs)
+        cached = await _time(_sql, teacher_id, runs)
+        rows = await _time(_rows, teacher_id, runs)
+        print(
+            f"{sessions:>4}x{students:<4} {attendance:>8} {sql:>8.1f} {cached:>9.1f} "
+            f"{rows:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50x100,200x300,400x500")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [
+        tuple(int(part) for part in size.split("x")) for size in args.sizes.split(",")
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        os.environ["REFLEX_DB_URL"] = f"sqlite:///{db}"
+        os.environ["REFLEX_ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{db}"
+        asyncio.run(_main(sizes, args.runs))
+
+
+if __name__ == "__main__":
+    main()
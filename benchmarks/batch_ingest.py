@@ -0,0 +1,96 @@
+"""Throughput of the kiosk/gateway batch endpoint across batch sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.batch_ingest [--records 5000] [--sizes 1,10,100,500,1000]
+
+Each batch size records ``--records`` fresh scans into its own session by
+POSTing to ``/api/scans/batch`` in-process, so the numbers include request
+parsing, token verification, the student lookup and the single insert
+transaction per request, but no network.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEVICE_KEY = "bench-device-key"
+
+
+async def _main(records: int, sizes: list[int]):
+    import httpx
+    import rxconfig
+    from app import repository
+    from app.api import api
+    from app.database import initialize_db
+    from app.models import Session, User
+    from app.tokens import issue_session_token
+
+    rxconfig.DEVICE_API_KEY = DEVICE_KEY
+    initialize_db()
+    await repository.add_users(
+        *(
+            User(
+                full_name=f"S{n}", password_hash="-", role="student", student_id=f"S{n}"
+            )
+            for n in range(records)
+        )
+    )
+    headers = {"Authorization": f"Bearer {DEVICE_KEY}"}
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for size in sizes:
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            session = await repository.create_class_session(
+                Session(
+                    teacher_id=1, course_name=f"batch {size}", expires_at=expires_at
+                )
+            )
+            inserted = 0
+            start = time.perf_counter()
+            for offset in range(0, records, size):
+                now = datetime.now(timezone.utc)
+                token = issue_session_token(session.id, expires_at, now=now)
+                batch = [
+                    {
+                        "key": uuid.uuid4().hex,
+                        "token": token,
+                        "student_id": f"S{n}",
+                        "scanned_at": now.timestamp(),
+                    }
+                    for n in range(offset, min(offset + size, records))
+                ]
+                response = await client.post(
+                    "/api/scans/batch", json={"records": batch}, headers=headers
+                )
+                inserted += response.json()["inserted"]
+            elapsed = time.perf_counter() - start
+            requests = -(-records // size)
+            print(
+                f"batch {size:>5}: {records / elapsed:9.1f} scans/s  "
+                f"{elapsed / requests * 1000:8.2f} ms/request  inserted {inserted}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--sizes", default="1,10,100,500,1000")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        os.environ["REFLEX_DB_URL"] = f"sqlite:///{db}"
+        os.environ["REFLEX_ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{db}"
+        asyncio.run(_main(args.records, sizes))
+
+
+if __name__ == "__main__":
+    main()
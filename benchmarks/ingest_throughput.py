@@ -0,0 +1,87 @@
+"""Scan throughput: one commit per scan vs. the batched ingestion queue.
+
+Run from the repository root:
+
+    python -m benchmarks.ingest_throughput [--scans 5000] [--concurrency 300]
+
+Scans are submitted concurrently from ``--concurrency`` coroutines, like a
+lecture hall of students hitting ``process_scan`` at once.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+async def _per_scan_insert(session_id: int, student_id: int, scanned_at: datetime):
+    from sqlalchemy.dialects.sqlite import insert
+    from app.database import get_async_session
+    from app.models import Attendance
+
+    async with get_async_session() as db:
+        await db.exec(
+            insert(Attendance)
+            .values(
+                session_id=session_id,
+                student_id=student_id,
+                scanned_at=scanned_at,
+                status="present",
+            )
+            .on_conflict_do_nothing(index_elements=["session_id", "student_id"])
+        )
+        await db.commit()
+
+
+async def _measure(submit, session_id: int, scans: int, concurrency: int) -> float:
+    students = iter(range(scans))
+
+    async def worker():
+        for student_id in students:
+            await submit(session_id, student_id, datetime.now(timezone.utc))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return scans / (time.perf_counter() - start)
+
+
+async def _main(scans: int, concurrency: int):
+    from app import repository
+    from app.database import initialize_db
+    from app.ingest import ingestor
+    from app.models import Session
+
+    initialize_db()
+    for mode in ("per-scan", "batched"):
+        session = await repository.create_class_session(
+            Session(
+                teacher_id=1,
+                course_name=mode,
+                expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+            )
+        )
+        if mode == "batched":
+            async with ingestor.lifespan():
+                rate = await _measure(ingestor.submit, session.id, scans, concurrency)
+        else:
+            rate = await _measure(_per_scan_insert, session.id, scans, concurrency)
+        print(f"{mode:>9}: {rate:9.1f} scans/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=300)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        os.environ["REFLEX_DB_URL"] = f"sqlite:///{db}"
+        os.environ["REFLEX_ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{db}"
+        asyncio.run(_main(args.scans, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
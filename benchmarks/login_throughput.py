@@ -0,0 +1,71 @@
+"""Login throughput and event-loop stall vs. bcrypt worker pool size.
+
+Run from the repository root:
+
+    python -m benchmarks.login_throughput [--logins 64] [--rounds 12]
+
+"inline" verifies on the event loop as the handlers used to. The other rows
+go through ``PasswordHasher`` with the given number of worker threads. "max
+stall" is the longest gap seen by a 1 ms ticker coroutine, i.e. the extra
+latency every other client would have observed.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import bcrypt
+
+from app.security import PasswordHasher
+
+
+async def _ticker(stop: asyncio.Event) -> float:
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    return worst
+
+
+async def _measure(verify, hashed: str, logins: int) -> tuple[float, float]:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(verify("secret", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return logins / elapsed, await ticker
+
+
+async def _inline_verify(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def _main(logins: int, rounds: int):
+    hashed = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds)).decode("utf-8")
+    print(f"bcrypt cost {rounds}, {logins} concurrent logins, {os.cpu_count()} CPUs")
+    rate, stall = await _measure(_inline_verify, hashed, logins)
+    print(f"  inline: {rate:7.1f} logins/s  max stall {stall * 1000:8.1f} ms")
+    for workers in (1, 2, 4, 8):
+        hasher = PasswordHasher(rounds, workers, max_pending=logins)
+        rate, stall = await _measure(hasher.verify, hashed, logins)
+        print(
+            f"pool={workers:<2}: {rate:7.1f} logins/s  max stall {stall * 1000:8.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+    asyncio.run(_main(args.logins, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""``show_qr_code`` latency and websocket payload: inline base64 PNG vs. cached URL.
+
+Run from the repository root:
+
+    python -m benchmarks.qr_payload [--clicks 200]
+
+"payload" is the JSON-encoded size of the ``qr_code_image`` value that goes
+out in the state delta on every "Show QR" click.
+"""
+
+import argparse
+import base64
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.qr import QRImageCache, render_png
+from app.tokens import issue_session_token
+
+EXPIRES_AT = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+def session_payload(session_id: int) -> str:
+    return issue_session_token(session_id, EXPIRES_AT)
+
+
+def _inline(session_id: int) -> str:
+    img_str = base64.b64encode(render_png(session_payload(session_id))).decode()
+    return f"data:image/png;base64,{img_str}"
+
+
+def _report(name: str, fn, clicks: int):
+    value = fn()
+    start = time.perf_counter()
+    for _ in range(clicks):
+        value = fn()
+    per_click = (time.perf_counter() - start) / clicks
+    size = len(json.dumps({"qr_code_image": value}))
+    print(f"{name:>14}: {per_click * 1e6:9.1f} us/click  payload {size:6d} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clicks", type=int, default=200)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = QRImageCache(
+            Path(tmp), memory_size=256, disk_size=2048, image_format="png"
+        )
+        _report("inline base64", lambda: _inline(42), args.clicks)
+        start = time.perf_counter()
+        cache.url_for(session_payload(7))
+        print(f"{'cached (miss)':>14}: {(time.perf_counter() - start) * 1e6:9.1f} us")
+        _report("cached URL", lambda: cache.url_for(session_payload(42)), args.clicks)
+
+
+if __name__ == "__main__":
+    main()
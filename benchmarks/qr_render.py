@@ -0,0 +1,41 @@
+"""QR render time and size: Pillow PNG vs. path-merged SVG.
+
+Run from the repository root:
+
+    python -m benchmarks.qr_render [--renders 200]
+"""
+
+import argparse
+import gzip
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.qr import GZIP_FORMATS, RENDERERS
+from app.tokens import issue_session_token
+
+EXPIRES_AT = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+def session_payload(session_id: int) -> str:
+    return issue_session_token(session_id, EXPIRES_AT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=200)
+    args = parser.parse_args()
+    for name, (render, _) in RENDERERS.items():
+        image = render(session_payload(1))
+        start = time.perf_counter()
+        for i in range(args.renders):
+            image = render(session_payload(i))
+        per_render = (time.perf_counter() - start) / args.renders
+        served = len(gzip.compress(image)) if name in GZIP_FORMATS else len(image)
+        print(
+            f"{name}: {per_render * 1e6:9.1f} us/render  {len(image):6d} bytes  "
+            f"{served:6d} served"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Scan commit latency with the default vs. the tuned SQLite engine profile.
+
+Run from the repository root:
+
+    python -m benchmarks.scan_commit [--scans 2000] [--writers 4] [--readers 2]
+
+Each writer thread commits one attendance row per transaction, like
+``process_scan``, while reader threads run analytics-style aggregate queries
+against the same file.
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import SQLModel, Session as DBSession, func, select
+
+from app.database import configure_engine
+from app.models import Attendance, Session
+
+
+def _run(engine, scans: int, writers: int, readers: int) -> dict:
+    SQLModel.metadata.create_all(engine)
+    with DBSession(engine) as db:
+        sess = Session(
+            teacher_id=1,
+            course_name="Bench",
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+        db.add(sess)
+        db.commit()
+        session_id = sess.id
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def writer(offset: int):
+        nonlocal errors
+        for student_id in range(offset, scans, writers):
+            start = time.perf_counter()
+            try:
+                with DBSession(engine) as db:
+                    db.exec(
+                        insert(Attendance)
+                        .values(
+                            session_id=session_id,
+                            student_id=student_id,
+                            scanned_at=datetime.now(timezone.utc),
+                            status="present",
+                        )
+                        .on_conflict_do_nothing(
+                            index_elements=["session_id", "student_id"]
+                        )
+                    )
+                    db.commit()
+            except exc.OperationalError:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    def reader():
+        while not done.is_set():
+            try:
+                with DBSession(engine) as db:
+                    db.exec(
+                        select(Attendance.student_id, func.count()).group_by(
+                            Attendance.student_id
+                        )
+                    ).all()
+            except exc.OperationalError:
+                pass
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [
+        threading.Thread(target=writer, args=(i,)) for i in range(writers)
+    ]
+    for t in reader_threads + writer_threads:
+        t.start()
+    start = time.perf_counter()
+    for t in writer_threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for t in reader_threads:
+        t.join()
+    engine.dispose()
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        "scans_per_s": len(latencies) / elapsed,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("default", "tuned"):
+            url = f"sqlite:///{Path(tmp) / profile}.db"
+            engine = create_engine(url, connect_args={"check_same_thread": False})
+            if profile == "tuned":
+                configure_engine(engine)
+            result = _run(engine, args.scans, args.writers, args.readers)
+            print(
+                f"{profile:>8}: p50 {result['p50_ms']:7.2f} ms  "
+                f"p95 {result['p95_ms']:7.2f} ms  "
+                f"{result['scans_per_s']:8.1f} scans/s  "
+                f"{result['errors']} lock errors"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Serialized size of each client-synced state, per connected client.
+
+Run from the repository root:
+
+    python -m benchmarks.state_size [--sessions 200] [--students 300] [--active 12]
+
+Seeds a teacher with ``--sessions`` sessions (``--active`` of them still
+running) attended by ``--students`` students, then runs the dashboard and
+analytics load events against a fresh state tree for the teacher and for one
+student. For every state it prints the bytes sent on hydrate (the full
+state) and the delta each event pushes over the websocket, along with the
+largest vars, which is what to look at when a number grows.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+def _size(value) -> int:
+    from reflex_base.utils import format
+
+    return len(format.json_dumps(value).encode())
+
+
+def _report(state, label: str, top: int):
+    for full_name, values in state.dict().items():
+        name = full_name.rsplit(".", 1)[-1].strip("_").replace("___", ".")
+        largest = sorted(values.items(), key=lambda item: -_size(item[1]))[:top]
+        detail = ", ".join(
+            f"{var.removesuffix('_rx_state_')} {_size(value)}" for var, value in largest
+        )
+        print(f"{label:>8} {name:<45} {_size(values):>8} B  ({detail})")
+
+
+async def _run(state, event) -> int:
+    """Run an event handler and return the size of the delta it produced."""
+    handler = getattr(state, event.fn.__name__)
+    result = handler()
+    if hasattr(result, "__aiter__"):
+        async for _ in result:
+            pass
+    elif asyncio.iscoroutine(result):
+        await result
+    delta = state._get_root_state().get_delta()
+    state._get_root_state()._clean()
+    return _size(delta)
+
+
+def _client(state_cls, user) -> object:
+    from reflex.state import State
+    from app.states.auth import AuthState
+
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth.user_id = user.id
+    auth.user_name = user.full_name
+    auth.user_role = user.role
+    auth.is_authenticated = True
+    root._clean()
+    return root.get_substate(state_cls.get_full_name().split(".")[1:])
+
+
+async def _main(sessions: int, students: int, active: int, top: int):
+    from app import repository
+    from app.database import initialize_db
+    from app.ingest import record_attendance
+    from app.models import Session, User
+    from app.states.analytics import AnalyticsState
+    from app.states.attendance import AttendanceState
+    from app.states.auth import AuthState
+    from app.states.session import SessionState
+
+    initialize_db()
+    teacher = User(full_name="Teacher", password_hash="-", role="teacher", email="t@x")
+    await repository.add_users(teacher)
+    pupils = [
+        User(
+            full_name=f"Student {n}",
+            password_hash="-",
+            role="student",
+            student_id=f"S{n}",
+        )
+        for n in range(students)
+    ]
+    await repository.add_users(*pupils)
+    teacher = await repository.get_user_by_email("t@x")
+    student = await repository.get_user_by_student_id("S0")
+    ids = sorted(
+        (await repository.get_student_ids([f"S{n}" for n in range(students)])).values()
+    )
+    now = datetime.now(timezone.utc)
+    rng = random.Random(0)
+    for n in range(sessions):
+        running = n >= sessions - active
+        session = await repository.create_class_session(
+            Session(
+                teacher_id=teacher.id,
+                course_name=f"CS{100 + n % 40} - Introduction to Computing",
+                created_at=now - timedelta(days=sessions - n),
+                expires_at=now + timedelta(hours=1) if running else now,
+                is_active=running,
+            )
+        )
+        await record_attendance(
+            [
+                (session.id, student_id, session.created_at)
+                for student_id in ids
+                if rng.random() < 0.7
+            ]
+        )
+
+    print(f"{'event':>8} {'state':<45} {'bytes':>8}")
+    for state_cls, user, events in [
+        (AuthState, teacher, []),
+        (SessionState, teacher, [SessionState.load_active_sessions]),
+        (AnalyticsState, teacher, [AnalyticsState.load_stats] * 2),
+        (AttendanceState, student, [AttendanceState.load_history]),
+    ]:
+        state = _client(state_cls, user)
+        for event in events:
+            delta = await _run(state, event)
+            print(f"{'delta':>8} {event.fn.__name__:<45} {delta:>8} B")
+        _report(state, "hydrate", top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--active", type=int, default=12)
+    parser.add_argument("--top", type=int, default=3, help="Largest vars to list.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        os.environ["REFLEX_DB_URL"] = f"sqlite:///{db}"
+        os.environ["REFLEX_ASYNC_DB_URL"] = f"sqlite+aiosqlite:///{db}"
+        asyncio.run(_main(args.sessions, args.students, args.active, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,81 @@
+import os
 import reflex as rx
 
-config = rx.Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin()])
+config = rx.Config(
+    app_name="app",
+    db_url="sqlite:///reflex.db",
+    async_db_url="sqlite+aiosqlite:///reflex.db",
+    plugins=[rx.plugins.TailwindV3Plugin()],
+)
+
+# PRAGMAs applied to every SQLite connection opened by app.database.get_engine.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "cache_size": -65536,
+    "busy_timeout": 5000,
+    "foreign_keys": "ON",
+}
+
+# Write-behind attendance ingestion: scans are committed in batches of up to
+# INGEST_MAX_BATCH rows, or after INGEST_MAX_DELAY_MS, whichever comes first.
+INGEST_MAX_BATCH = 500
+INGEST_MAX_DELAY_MS = 5
+
+# Password hashing: bcrypt cost factor, hashing threads, and the number of
+# queued/running hash jobs beyond which logins are refused as "busy".
+# Stored hashes with a different cost are rehashed on the next login.
+BCRYPT_ROUNDS = 12
+HASH_WORKERS = 4
+HASH_MAX_PENDING = 64
+
+# How often the background sweeper deactivates expired sessions. Scans trust
+# Session.is_active, so this is also the longest a session can accept scans
+# past its expiry.
+SESSION_SWEEP_INTERVAL_SECONDS = 15
+
+# Minimum seconds between live attendee-count pushes to a teacher dashboard;
+# scans committed in between are coalesced into one update.
+LIVE_COUNT_INTERVAL_SECONDS = 1.0
+
+# QR image format: "svg" (vector, sharp on projectors, no raster step) or "png".
+QR_RENDER_MODE = "svg"
+
+# Rendered QR images kept in memory and in uploaded_files/qr (LRU entries).
+QR_CACHE_SIZE = 256
+QR_DISK_CACHE_SIZE = 2048
+
+# Signed QR tokens. The secret must be shared by every backend worker and kept
+# stable across restarts; set ATTENDQR_TOKEN_SECRET in production. Codes rotate
+# every QR_TOKEN_ROTATION_SECONDS and stay valid for QR_TOKEN_GRACE_WINDOWS
+# extra windows so a scan taken just before a rotation still succeeds.
+QR_TOKEN_SECRET = os.environ.get("ATTENDQR_TOKEN_SECRET", "")
+QR_TOKEN_ROTATION_SECONDS = 30
+QR_TOKEN_GRACE_WINDOWS = 1
+
+# Seconds an active session stays in the scan-path cache before it is re-read.
+ACTIVE_SESSION_CACHE_TTL_SECONDS = 30
+
+# Computed analytics payloads kept per (teacher, filters, data version), and
+# the seconds each stays valid.
+ANALYTICS_CACHE_SIZE = 256
+ANALYTICS_CACHE_TTL_SECONDS = 60
+
+# Queued scans older than this when they are replayed are rejected. Their age
+# is reported by the device, so keep this close to a class length.
+OFFLINE_SCAN_MAX_AGE_SECONDS = 90 * 60
+# Idempotency keys of replayed scans remembered for cheap duplicate answers.
+SCAN_REPLAY_CACHE_SIZE = 10000
+
+# Bearer key for kiosks and gateways posting to /api/scans/batch. The
+# endpoint is disabled while it is empty.
+DEVICE_API_KEY = os.environ.get("ATTENDQR_DEVICE_KEY", "")
+# Most records accepted in one batch request.
+SCAN_BATCH_MAX_RECORDS = 1000
+
+# Most badge reads a kiosk sends in one event.
+KIOSK_MAX_BATCH = 50
+
+# Processes that compute QR matrices for bulk badge sheets.
+BADGE_WORKERS = os.cpu_count() or 1